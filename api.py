@@ -0,0 +1,244 @@
+"""Local read-only JSON API over the runs saved in ``RESULTS_STORE``.
+
+Endpoints:
+    GET  /latest          the most recent run, including raw HTML fragments
+    GET  /history         a summary of every run (XP and stats, no HTML)
+    GET  /runs/<run_id>   one stored run
+    GET  /refresh         whether a background scrape is running
+    POST /refresh         start a background scrape (only with ``allow_refresh``)
+
+Responses are cached in memory for ``ttl`` seconds and carry an ETag, so
+clients can revalidate with ``If-None-Match`` and get a 304.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import store
+
+CLI_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cli.py")
+
+_RUN_ID_RE = re.compile(r"^[0-9]{8}T[0-9]+Z$")
+
+
+class NotFound(Exception):
+    pass
+
+
+class ResultsCache:
+    def __init__(self, ttl, clock=time.monotonic):
+        self.ttl = ttl
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._entries = {}
+
+    def get(self, key, build):
+        """Return ``(body, etag)`` for ``key``, calling ``build()`` when missing or expired."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry and entry[2] > now:
+            return entry[0], entry[1]
+
+        body = json.dumps(build()).encode()
+        etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        with self._lock:
+            self._entries[key] = (body, etag, now + self.ttl)
+        return body, etag
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class RefreshCoordinator:
+    """Runs at most one background scrape; triggers during a scrape join it."""
+
+    def __init__(self, run, on_complete=None):
+        self._run = run
+        self._on_complete = on_complete
+        self._lock = threading.Lock()
+        self._thread = None
+        self.last_error = None
+        self.last_finished_at = None
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def trigger(self):
+        """Start a scrape unless one is running. Returns whether a new one started."""
+        with self._lock:
+            if self.running:
+                return False
+            self._thread = threading.Thread(target=self._refresh, name="refresh", daemon=True)
+            self._thread.start()
+            return True
+
+    def wait(self, timeout=None):
+        thread = self._thread
+        if thread:
+            thread.join(timeout)
+
+    def _refresh(self):
+        try:
+            self._run()
+            self.last_error = None
+        except Exception as e:
+            self.logger.error(f"Background refresh failed: {e!s}")
+            self.last_error = str(e)
+        finally:
+            self.last_finished_at = time.time()
+            if self._on_complete:
+                self._on_complete()
+
+
+def scrape_into_store(store_dir):
+    """Run ``cli.py scrape`` in a subprocess that saves its results to ``store_dir``."""
+    # A refresh only updates the store; the scheduled run is the one that emails.
+    env = {**os.environ, "RESULTS_STORE": store_dir, "SEND_EMAIL": "false"}
+    before = set(store.list_runs(store_dir))
+    subprocess.run([sys.executable, CLI_PATH, "scrape"], env=env, check=True)
+    # The scrape logs its errors and exits 0, so a missing run file is the failure signal.
+    if not set(store.list_runs(store_dir)) - before:
+        raise RuntimeError("Scrape finished without saving a run; see its log for errors")
+
+
+def summarize_run(run):
+    return {
+        "created_at": run["created_at"],
+        "ixl": {
+            name: {key: data[key] for key in ("stats", "skipped") if key in data}
+            for name, data in run["ixl"].items()
+        },
+        "math_academy": {
+            name: {
+                key: data[key]
+                for key in ("daily_xp_earned", "daily_xp_goal", "weekly_xp", "skipped")
+                if key in data
+            }
+            for name, data in run["math_academy"].items()
+        },
+    }
+
+
+class ResultsAPI:
+    def __init__(self, store_dir, ttl=60, allow_refresh=False, refresh=None, clock=time.monotonic):
+        self.store_dir = store_dir
+        self.cache = ResultsCache(ttl, clock)
+        # {path: summary}. Run files are never rewritten, so a summary stays valid.
+        self._summaries = {}
+        self.refresher = None
+        if allow_refresh:
+            self.refresher = RefreshCoordinator(
+                refresh or (lambda: scrape_into_store(store_dir)), on_complete=self.cache.clear
+            )
+
+    def latest(self):
+        runs = store.list_runs(self.store_dir)
+        if not runs:
+            raise NotFound("No stored runs")
+        return {"run_id": store.run_id(runs[-1]), **store.load_run(runs[-1])}
+
+    def history(self):
+        # Only new runs are loaded; dropping the rest forgets runs deleted from the store.
+        self._summaries = {
+            path: self._summaries.get(path)
+            or {"run_id": store.run_id(path), **summarize_run(store.load_run(path))}
+            for path in store.list_runs(self.store_dir)
+        }
+        return list(self._summaries.values())
+
+    def run(self, run_id):
+        path = store.run_path(self.store_dir, run_id)
+        if not _RUN_ID_RE.match(run_id) or not os.path.exists(path):
+            raise NotFound(f"Unknown run: {run_id}")
+        return {"run_id": run_id, **store.load_run(path)}
+
+    def get(self, path):
+        """Return ``(body, etag)`` for a cached read-only endpoint."""
+        if path == "/latest":
+            return self.cache.get(path, self.latest)
+        if path == "/history":
+            return self.cache.get(path, self.history)
+        if path.startswith("/runs/"):
+            return self.cache.get(path, lambda: self.run(path[len("/runs/") :]))
+        raise NotFound(f"Unknown path: {path}")
+
+    def refresh_status(self):
+        return {
+            "refreshing": self.refresher.running,
+            "last_finished_at": self.refresher.last_finished_at,
+            "last_error": self.refresher.last_error,
+        }
+
+
+class _Server(ThreadingHTTPServer):
+    def __init__(self, api, server_address):
+        self.api = api
+        super().__init__(server_address, _Handler)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "ixl-api"
+    server: _Server
+
+    @property
+    def api(self):
+        return self.server.api
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0].rstrip("/") or "/"
+        if path == "/refresh" and self.api.refresher:
+            self._send_json(200, self.api.refresh_status())
+            return
+        try:
+            body, etag = self.api.get(path)
+        except NotFound as e:
+            self._send_json(404, {"error": str(e)})
+            return
+
+        if etag in (tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self._send_body(200, body, etag)
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path != "/refresh" or not self.api.refresher:
+            self._send_json(405, {"error": "Read-only API"})
+            return
+        started = self.api.refresher.trigger()
+        self._send_json(202, {"started": started, **self.api.refresh_status()})
+
+    def _send_json(self, status, payload):
+        self._send_body(status, json.dumps(payload).encode())
+
+    def _send_body(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        # Let clients keep a copy but revalidate it with the ETag each time.
+        self.send_header("Cache-Control", "no-cache")
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logging.getLogger("ResultsAPI").info(format % args)
+
+
+def make_server(api, host="127.0.0.1", port=8000):
+    return _Server(api, (host, port))
@@ -0,0 +1,426 @@
+"""Minimal asyncio client for the Chrome DevTools Protocol.
+
+One headless Chrome is driven over a single WebSocket. Every tab is attached
+as a flattened session, so many pages can be awaited concurrently from one
+event loop without a WebDriver process per page.
+"""
+
+import asyncio
+import base64
+import contextlib
+import itertools
+import json
+import logging
+import os
+import re
+import shutil
+import tempfile
+from urllib.parse import urlsplit
+
+from wsproto import ConnectionType, WSConnection
+from wsproto.events import (
+    AcceptConnection,
+    CloseConnection,
+    Ping,
+    RejectConnection,
+    Request,
+    TextMessage,
+)
+
+# Locator strategies accepted by Page, re-exported for callers.
+from sites import CSS_SELECTOR as CSS_SELECTOR
+from sites import ID as ID
+from sites import XPATH as XPATH
+
+CHROME_EXECUTABLES = (
+    "google-chrome",
+    "google-chrome-stable",
+    "chromium",
+    "chromium-browser",
+    "chrome",
+)
+
+# Errors raised when a navigation replaces the document an evaluation was running in.
+_CONTEXT_LOST_ERRORS = (
+    "Execution context was destroyed",
+    "Cannot find context with specified id",
+    "Inspected target navigated or closed",
+)
+
+# Waits for an element in the page itself, resolving as soon as a DOM mutation
+# makes it match instead of polling from Python.
+_LOCATE_JS = """
+(by, value, condition, text, timeoutMs) => new Promise((resolve) => {
+  const find = () => {
+    let el = null;
+    if (by === "id") {
+      el = document.getElementById(value);
+    } else if (by === "css selector") {
+      el = document.querySelector(value);
+    } else {
+      el = document.evaluate(
+        value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+      ).singleNodeValue;
+    }
+    if (!el) return null;
+    if (condition === "clickable") {
+      const rect = el.getBoundingClientRect();
+      if ((!rect.width && !rect.height) || el.disabled) return null;
+    }
+    if (condition === "text" && !(el.textContent || "").includes(text)) return null;
+    return el;
+  };
+  const done = (el) => {
+    observer.disconnect();
+    clearTimeout(timer);
+    window.__cdpLocated = el;
+    resolve(el !== null);
+  };
+  const observer = new MutationObserver(() => {
+    const el = find();
+    if (el) done(el);
+  });
+  const timer = setTimeout(() => done(null), timeoutMs);
+  const el = find();
+  if (el) {
+    done(el);
+  } else {
+    observer.observe(document, {
+      subtree: true, childList: true, attributes: true, characterData: true
+    });
+  }
+})
+"""
+
+
+class CDPError(Exception):
+    pass
+
+
+def find_chrome():
+    """Return the Chrome executable from ``CHROME_BIN`` or the PATH, if any."""
+    if os.environ.get("CHROME_BIN"):
+        return os.environ["CHROME_BIN"]
+    for name in CHROME_EXECUTABLES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+class CDPConnection:
+    def __init__(self, reader, writer, ws):
+        self._reader = reader
+        self._writer = writer
+        self._ws = ws
+        self._ids = itertools.count(1)
+        self._pending = {}
+        self._event_waiters = {}
+        self._read_task = None
+
+    @classmethod
+    async def connect(cls, ws_url):
+        url = urlsplit(ws_url)
+        reader, writer = await asyncio.open_connection(url.hostname, url.port)
+        ws = WSConnection(ConnectionType.CLIENT)
+        writer.write(ws.send(Request(host=url.netloc, target=url.path)))
+        await writer.drain()
+
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                raise CDPError(f"Connection closed during handshake with {ws_url}")
+            ws.receive_data(data)
+            for event in ws.events():
+                if isinstance(event, RejectConnection):
+                    raise CDPError(f"DevTools rejected connection: {event.status_code}")
+                if isinstance(event, AcceptConnection):
+                    connection = cls(reader, writer, ws)
+                    connection._read_task = asyncio.create_task(connection._read_loop())
+                    return connection
+
+    async def send(self, method, params=None, session_id=None):
+        message_id = next(self._ids)
+        message = {"id": message_id, "method": method, "params": params or {}}
+        if session_id:
+            message["sessionId"] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[message_id] = future
+        self._writer.write(self._ws.send(TextMessage(data=json.dumps(message))))
+        await self._writer.drain()
+        return await future
+
+    def expect_event(self, method, session_id=None, predicate=None):
+        """Return a future for the next matching event.
+
+        Call this before triggering the action that fires the event so it cannot be missed.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._event_waiters.setdefault((session_id, method), []).append((predicate, future))
+        return future
+
+    async def _read_loop(self):
+        buffer = []
+        try:
+            while True:
+                data = await self._reader.read(65536)
+                if not data:
+                    break
+                self._ws.receive_data(data)
+                for event in self._ws.events():
+                    if isinstance(event, TextMessage):
+                        buffer.append(event.data)
+                        if event.message_finished:
+                            self._dispatch(json.loads("".join(buffer)))
+                            buffer = []
+                    elif isinstance(event, Ping):
+                        self._writer.write(self._ws.send(event.response()))
+                    elif isinstance(event, CloseConnection):
+                        return
+        finally:
+            self._fail_pending(CDPError("DevTools connection closed"))
+
+    def _dispatch(self, message):
+        if "id" in message:
+            future = self._pending.pop(message["id"], None)
+            if future is None or future.done():
+                return
+            if "error" in message:
+                future.set_exception(CDPError(message["error"].get("message", str(message))))
+            else:
+                future.set_result(message.get("result", {}))
+            return
+
+        key = (message.get("sessionId"), message.get("method"))
+        waiters = self._event_waiters.get(key, [])
+        params = message.get("params", {})
+        remaining = []
+        for predicate, future in waiters:
+            if future.done():
+                continue
+            if predicate is None or predicate(params):
+                future.set_result(params)
+            else:
+                remaining.append((predicate, future))
+        if remaining:
+            self._event_waiters[key] = remaining
+        else:
+            self._event_waiters.pop(key, None)
+
+    def _fail_pending(self, error):
+        for future in self._pending.values():
+            if not future.done():
+                future.set_exception(error)
+        self._pending.clear()
+        for waiters in self._event_waiters.values():
+            for _, future in waiters:
+                if not future.done():
+                    future.set_exception(error)
+        self._event_waiters.clear()
+
+    async def close(self):
+        try:
+            self._writer.write(self._ws.send(CloseConnection(code=1000)))
+            await self._writer.drain()
+        except Exception:
+            pass
+        self._writer.close()
+        if self._read_task:
+            self._read_task.cancel()
+
+
+class Browser:
+    def __init__(self, process, connection, user_data_dir):
+        self.process = process
+        self.connection = connection
+        self.user_data_dir = user_data_dir
+        self._stderr_task = None
+
+    @classmethod
+    async def launch(cls, headless=True, executable=None, timeout=30):
+        executable = executable or find_chrome()
+        if not executable:
+            raise FileNotFoundError("Chrome executable not found; set CHROME_BIN")
+
+        user_data_dir = tempfile.mkdtemp(prefix="ixl-cdp-")
+        args = [
+            executable,
+            "--remote-debugging-port=0",
+            f"--user-data-dir={user_data_dir}",
+            "--no-sandbox",
+            "--disable-dev-shm-usage",
+            "--no-first-run",
+            "--no-default-browser-check",
+            "--window-size=1920,1080",
+        ]
+        if headless:
+            args.append("--headless=new")
+        args.append("about:blank")
+
+        process = await asyncio.create_subprocess_exec(
+            *args, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            ws_url = await asyncio.wait_for(cls._read_ws_url(process), timeout)
+            connection = await CDPConnection.connect(ws_url)
+        except BaseException:
+            # Chrome may have exited already, which is usually why we got here.
+            with contextlib.suppress(ProcessLookupError):
+                process.kill()
+            await process.wait()
+            shutil.rmtree(user_data_dir, ignore_errors=True)
+            raise
+
+        browser = cls(process, connection, user_data_dir)
+        # Keep draining stderr so Chrome never blocks on a full pipe.
+        browser._stderr_task = asyncio.create_task(process.stderr.read())
+        return browser
+
+    @staticmethod
+    async def _read_ws_url(process):
+        while True:
+            line = await process.stderr.readline()
+            if not line:
+                raise CDPError("Chrome exited before opening the DevTools endpoint")
+            match = re.search(rb"DevTools listening on (ws://\S+)", line)
+            if match:
+                return match.group(1).decode()
+
+    async def new_page(self):
+        target = await self.connection.send("Target.createTarget", {"url": "about:blank"})
+        attached = await self.connection.send(
+            "Target.attachToTarget", {"targetId": target["targetId"], "flatten": True}
+        )
+        page = Page(self.connection, attached["sessionId"], target["targetId"])
+        await page.send("Page.enable")
+        return page
+
+    async def close(self):
+        try:
+            await asyncio.wait_for(self.connection.send("Browser.close"), 5)
+        except Exception:
+            # Chrome often drops the socket before replying; make sure it is gone.
+            with contextlib.suppress(ProcessLookupError):
+                self.process.kill()
+        await self.connection.close()
+        await self.process.wait()
+        if self._stderr_task:
+            self._stderr_task.cancel()
+        shutil.rmtree(self.user_data_dir, ignore_errors=True)
+
+
+class Page:
+    def __init__(self, connection, session_id, target_id):
+        self.connection = connection
+        self.session_id = session_id
+        self.target_id = target_id
+
+    async def send(self, method, params=None):
+        return await self.connection.send(method, params, session_id=self.session_id)
+
+    def expect_event(self, method, predicate=None):
+        return self.connection.expect_event(method, self.session_id, predicate)
+
+    async def goto(self, url, timeout=30):
+        loaded = self.expect_event("Page.loadEventFired")
+        result = await self.send("Page.navigate", {"url": url})
+        if result.get("errorText"):
+            loaded.cancel()
+            raise CDPError(f"Navigation to {url} failed: {result['errorText']}")
+        if "loaderId" not in result:
+            # Same-document navigation (e.g. a fragment change) fires no load event.
+            loaded.cancel()
+            return
+        await asyncio.wait_for(loaded, timeout)
+
+    def expect_navigation(self, away_from=None):
+        """Return a future resolved when the main frame commits a new URL."""
+
+        def is_main_frame_change(params):
+            frame = params["frame"]
+            return "parentId" not in frame and frame.get("url") != away_from
+
+        return self.expect_event("Page.frameNavigated", is_main_frame_change)
+
+    async def evaluate(self, expression, await_promise=False):
+        result = await self.send(
+            "Runtime.evaluate",
+            {
+                "expression": expression,
+                "awaitPromise": await_promise,
+                "returnByValue": True,
+            },
+        )
+        if "exceptionDetails" in result:
+            details = result["exceptionDetails"]
+            message = details.get("exception", {}).get("description") or details.get("text")
+            raise CDPError(message)
+        return result["result"].get("value")
+
+    async def wait_for(self, by, value, timeout=10, condition="present", text=None):
+        """Wait until an element matches and remember it for the helpers below."""
+        deadline = asyncio.get_running_loop().time() + timeout
+        while True:
+            remaining = deadline - asyncio.get_running_loop().time()
+            if remaining <= 0:
+                raise TimeoutError(f"Element not found: {by}={value}")
+            args = json.dumps([by, value, condition, text, int(remaining * 1000)])
+            try:
+                found = await self.evaluate(f"({_LOCATE_JS})(...{args})", await_promise=True)
+            except CDPError as e:
+                # The page navigated away mid-wait; look again in the new document.
+                if any(error in str(e) for error in _CONTEXT_LOST_ERRORS):
+                    continue
+                raise
+            if not found:
+                raise TimeoutError(f"Element not found: {by}={value}")
+            return
+
+    async def text(self, by, value, timeout=10):
+        await self.wait_for(by, value, timeout)
+        return await self.evaluate("window.__cdpLocated.innerText")
+
+    async def outer_html(self, by, value, timeout=10):
+        await self.wait_for(by, value, timeout)
+        return await self.evaluate("window.__cdpLocated.outerHTML")
+
+    async def attribute_values(self, css_selector, name):
+        args = json.dumps([css_selector, name])
+        return await self.evaluate(
+            f"((selector, name) => Array.from(document.querySelectorAll(selector),"
+            f" (el) => el.getAttribute(name)))(...{args})"
+        )
+
+    async def click(self, by, value, timeout=10):
+        await self.wait_for(by, value, timeout, condition="clickable")
+        x, y = await self.evaluate(
+            "(() => { const el = window.__cdpLocated;"
+            " el.scrollIntoView({block: 'center', inline: 'center'});"
+            " const r = el.getBoundingClientRect();"
+            " return [r.left + r.width / 2, r.top + r.height / 2]; })()"
+        )
+        for event_type in ("mouseMoved", "mousePressed", "mouseReleased"):
+            await self.send(
+                "Input.dispatchMouseEvent",
+                {"type": event_type, "x": x, "y": y, "button": "left", "clickCount": 1},
+            )
+
+    async def type(self, by, value, text, clear=False, timeout=10):
+        await self.wait_for(by, value, timeout)
+        await self.evaluate(
+            "(() => { const el = window.__cdpLocated; el.focus();"
+            f" if ({json.dumps(clear)}) el.value = ''; }})()"
+        )
+        await self.send("Input.insertText", {"text": text})
+
+    async def screenshot(self, path):
+        try:
+            result = await self.send("Page.captureScreenshot", {"format": "png"})
+            with open(path, "wb") as f:
+                f.write(base64.b64decode(result["data"]))
+        except Exception:
+            logging.getLogger(self.__class__.__name__).warning(f"Could not save {path}")
+
+    async def close(self):
+        await self.connection.send("Target.closeTarget", {"targetId": self.target_id})
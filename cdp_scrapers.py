@@ -0,0 +1,329 @@
+"""Asyncio scraper backend driving many tabs of one Chrome over CDP.
+
+Like ``IXLStatsScraper`` and ``MathAcademyStatsScraper`` in ``get_stats``,
+these take their URLs, locators and per-student bookkeeping from ``sites``
+and only implement the browser I/O, so ``student_data`` has the same shape
+whichever backend produced it.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from abc import ABC, abstractmethod
+
+import memory
+import planner
+import sites
+from cdp import Browser
+
+
+class AsyncBaseStatsScraper(ABC):
+    def __init__(self, browser):
+        self.browser = browser
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.student_data = {}
+        # Called as on_student(student_name, data) once a student is fully extracted.
+        self.on_student = None
+        self.memory_monitor = None
+        self.planner = planner.RunPlanner()
+
+    async def student_done(self, student_name, data):
+        # Run the callback off the event loop: it may block to apply backpressure.
+        if self.on_student:
+            await asyncio.to_thread(self.on_student, student_name, data)
+        if self.memory_monitor:
+            self.memory_monitor.sample(
+                f"{self.__class__.__name__} student {student_name}", self.browser.process.pid
+            )
+
+    async def find_element(self, page, by, value, timeout=10):
+        try:
+            await page.wait_for(by, value, timeout)
+        except TimeoutError:
+            self.logger.error(f"Element not found: {by}={value}")
+            await page.screenshot(f"element_not_found_{value.replace(' ', '_')}.png")
+            raise
+
+    async def click_element(self, page, by, value, timeout=10):
+        try:
+            await page.click(by, value, timeout)
+        except TimeoutError:
+            self.logger.error(f"Element not clickable: {by}={value}")
+            await page.screenshot(f"element_not_clickable_{value}.png")
+            raise
+
+    @abstractmethod
+    async def login(self, page, username, password):
+        pass
+
+    @abstractmethod
+    async def process_student_data(self, page, student_id):
+        pass
+
+    @abstractmethod
+    async def get_stats(self, *args, **kwargs):
+        pass
+
+
+class CDPIXLStatsScraper(sites.IXLSite, AsyncBaseStatsScraper):
+    """IXL keeps the selected student in the page, so students are visited in one tab."""
+
+    async def login(self, page, username, password):
+        try:
+            await page.goto(self.login_url)
+            await page.type(*self.USERNAME, username)
+            await page.type(*self.PASSWORD, password)
+            await self.click_element(page, *self.SUBMIT)
+            self.logger.info("Successfully logged in to IXL")
+
+            await self.find_element(page, *self.SUBACCOUNTS)
+            await self.click_element(page, *self.PARENT_SUBACCOUNT)
+            self.logger.info("Selected 'Parent' subaccount")
+
+        except Exception as e:
+            self.logger.error(f"Login or subaccount selection failed: {e!s}")
+            await page.screenshot("ixl_login_error.png")
+            raise
+
+    async def select_date_range(self, page, option="Today"):
+        try:
+            await self.find_element(page, *self.DATE_RANGE)
+            await self.click_element(page, *self.DATE_RANGE_OPEN)
+            await self.find_element(page, *self.DATE_RANGE_BODY)
+            await self.click_element(page, *self.date_range_option(option))
+            await page.wait_for(*self.DATE_RANGE_SELECTION, condition="text", text=option)
+            self.logger.info(f"Selected date range: {option}")
+        except Exception as e:
+            self.logger.error(f"Failed to select date range: {e!s}")
+            await page.screenshot("ixl_date_range_error.png")
+            raise
+
+    async def open_student_options(self, page):
+        await self.click_element(page, *self.STUDENT_SELECT_OPEN)
+        await self.find_element(page, *self.STUDENT_SELECT_BODY)
+
+    async def get_student_names(self, page):
+        await self.open_student_options(page)
+        return await page.attribute_values(self.STUDENT_OPTIONS, self.STUDENT_NAME_ATTRIBUTE)
+
+    async def select_student(self, page, student_name):
+        try:
+            await self.open_student_options(page)
+            await page.click(
+                sites.CSS_SELECTOR,
+                f"{self.STUDENT_OPTIONS}[{self.STUDENT_NAME_ATTRIBUTE}="
+                f"{json.dumps(student_name, ensure_ascii=False)}]",
+            )
+            await page.wait_for(*self.STUDENT_SELECTION, condition="text", text=student_name)
+            return True
+        except TimeoutError:
+            self.logger.error(f"Failed to select student {student_name}.")
+            return False
+
+    async def process_student_data(self, page, student_id):
+        """Record the summary stats and return whether there is progress to fetch."""
+        student_name = student_id
+        try:
+            await asyncio.sleep(self.settle_delay)
+            return self.record_summary(student_name, await page.text(*self.SUMMARY_STATS))
+
+        except Exception as e:
+            self.logger.error(f"Error processing IXL data for {student_name}: {e!s}")
+            return False
+
+    async def collect_progress(self, page, student_name):
+        try:
+            await self.get_progress_and_improvement_data(page, student_name)
+        except Exception as e:
+            self.logger.error(f"Error processing IXL data for {student_name}: {e!s}")
+
+    async def run_step(self, page, step, student_name, sections):
+        """Carry out one step from ``planner.ixl_steps`` and return its outcome."""
+        if step == planner.SELECT:
+            self.logger.info(f"Processing IXL student: {student_name}")
+            selected = await self.select_student(page, student_name)
+            if not selected:
+                self.logger.warning(f"Failed to select IXL student: {student_name}")
+            return selected
+        if step == planner.SUMMARY:
+            return await self.process_student_data(page, student_name)
+        if step == planner.DETAIL:
+            await self.collect_progress(page, student_name)
+        elif step == planner.SKIP:
+            self.skip_sections(student_name, sections)
+        elif step == planner.FINISH:
+            await self.finish_student(student_name)
+        return None
+
+    async def finish_student(self, student_name):
+        if student_name in self.student_data:
+            await self.student_done(student_name, self.student_data[student_name])
+
+    async def scrape_students(self, page, student_names):
+        """Scrape students on the logged-in usage page in the order ``self.planner`` picks."""
+        steps = planner.Steps(planner.ixl_steps(self.planner, student_names))
+        for step in steps:
+            steps.outcome = await self.run_step(page, *step)
+
+    async def get_progress_and_improvement_data(self, page, student_name):
+        try:
+            await page.goto(self.progress_url)
+            self.logger.info(f"Navigated to Progress and Improvement page for {student_name}")
+            await asyncio.sleep(self.settle_delay)
+
+            table_html = await page.outer_html(*self.PROGRESS_TABLE)
+            args = json.dumps([self.SKILL_ROWS, self.SKILL_FIELDS, self.SKILL_SCORES])
+            rows = await page.evaluate(
+                "((rowSelector, fields, scoreSelector) =>"
+                " Array.from(document.querySelectorAll(rowSelector), (row) => ({"
+                " ...Object.fromEntries(fields.map(([field, selector]) =>"
+                " [field, row.querySelector(selector)?.innerText])),"
+                " scores: Array.from(row.querySelectorAll(scoreSelector), (s) => s.innerText)"
+                f" }})))(...{args})"
+            )
+            self.record_progress(student_name, table_html, rows)
+
+            await page.goto(self.login_url)
+            self.logger.info(f"Navigated back to main analytics page for {student_name}")
+
+        except Exception as e:
+            self.logger.error(
+                f"Error extracting IXL progress and improvement data for {student_name}: {e!s}"
+            )
+            await page.screenshot(f"ixl_progress_improvement_error_{student_name}.png")
+            raise
+
+    async def get_stats(self, username, password):
+        page = await self.browser.new_page()
+        try:
+            await self.login(page, username, password)
+            await self.select_date_range(page, "Today")
+
+            await self.scrape_students(page, await self.get_student_names(page))
+
+        except Exception as e:
+            self.logger.error(f"An error occurred during IXL stats collection: {e!s}")
+        finally:
+            await page.close()
+
+
+class CDPMathAcademyStatsScraper(sites.MathAcademySite, AsyncBaseStatsScraper):
+    """Each student's activity page is loaded in its own tab, up to ``max_tabs`` at once."""
+
+    def __init__(self, browser, max_tabs=4):
+        super().__init__(browser)
+        self.max_tabs = max_tabs
+
+    async def login(self, page, username, password):
+        try:
+            await page.goto(self.login_url)
+            await page.type(*self.USERNAME, username, clear=True)
+            await page.type(*self.PASSWORD, password, clear=True)
+
+            navigated = page.expect_navigation(away_from=self.login_url)
+            await self.click_element(page, *self.LOGIN_BUTTON)
+            await asyncio.wait_for(navigated, 10)
+
+            self.logger.info("Successfully logged in to Math Academy")
+        except Exception as e:
+            self.logger.error(f"Login failed for Math Academy: {e!s}")
+            await page.screenshot("math_academy_login_error.png")
+            raise
+
+    async def process_student_data(self, page, student_id):
+        try:
+            await page.goto(self.base_activity_url.format(student_id))
+
+            return self.student_entry(
+                student_id,
+                await page.text(*self.STUDENT_NAME),
+                await page.text(*self.DAILY_XP),
+                await page.text(*self.WEEKLY_XP),
+                await page.outer_html(*self.ACTIVITY),
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Error processing Math Academy data for student ID {student_id}: {e!s}"
+            )
+            await page.screenshot(f"math_academy_student_{student_id}_error.png")
+            return None
+
+    async def _process_in_new_tab(self, semaphore, student_id):
+        async with semaphore:
+            if not self.planner.start_summary("math_academy", student_id):
+                result = self.skipped_entry(student_id)
+            else:
+                page = await self.browser.new_page()
+                try:
+                    with self.planner.timed("math_academy", student_id, planner.SUMMARY):
+                        result = await self.process_student_data(page, student_id)
+                finally:
+                    await page.close()
+        if result is not None:
+            await self.student_done(*result)
+        return result
+
+    async def get_stats(self, username, password, student_ids):
+        try:
+            page = await self.browser.new_page()
+            try:
+                await self.login(page, username, password)
+            finally:
+                await page.close()
+
+            # Tabs share the browser's cookies, so every tab is already logged in.
+            semaphore = asyncio.Semaphore(self.max_tabs)
+            results = await asyncio.gather(
+                *(
+                    self._process_in_new_tab(semaphore, student_id)
+                    for student_id in self.planner.plan("math_academy", student_ids)
+                )
+            )
+            # Insert in the planned order regardless of which tab finished first.
+            for result in results:
+                if result is not None:
+                    student_name, data = result
+                    self.student_data[student_name] = data
+
+        except Exception as e:
+            self.logger.error(f"An error occurred during Math Academy stats collection: {e!s}")
+
+
+async def scrape_all(
+    ixl_username,
+    ixl_password,
+    mathacademy_username,
+    mathacademy_password,
+    mathacademy_student_ids,
+    on_student=None,
+    run_planner=None,
+):
+    """Scrape IXL and Math Academy concurrently in one browser.
+
+    See ``sites.Site.attach`` for ``on_student`` and ``run_planner``. Returns the
+    ``student_data`` of both scrapers as ``(ixl_data, math_academy_data)``.
+    """
+    headless_mode = os.environ.get("HEADLESS", "true").lower() == "true"
+    max_tabs = int(os.environ.get("CDP_MAX_TABS", "4"))
+
+    # Memory is only logged: there is no ceiling, as the shared browser is never restarted.
+    memory_monitor = memory.MemoryMonitor()
+    run_planner = planner.for_scrape(run_planner, mathacademy_student_ids)
+
+    browser = await Browser.launch(headless=headless_mode)
+    try:
+        ixl_scraper = CDPIXLStatsScraper(browser)
+        math_academy_scraper = CDPMathAcademyStatsScraper(browser, max_tabs=max_tabs)
+        for scraper in (ixl_scraper, math_academy_scraper):
+            scraper.attach(run_planner, memory_monitor, on_student)
+        await asyncio.gather(
+            ixl_scraper.get_stats(ixl_username, ixl_password),
+            math_academy_scraper.get_stats(
+                mathacademy_username, mathacademy_password, mathacademy_student_ids
+            ),
+        )
+        return ixl_scraper.student_data, math_academy_scraper.student_data
+    finally:
+        await browser.close()
+        memory_monitor.log_peak()
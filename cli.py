@@ -0,0 +1,249 @@
+"""Command-line entry point.
+
+Each subcommand imports only the modules it needs, so ``validate`` and
+``--help`` start without loading selenium, bs4 or pandas.
+
+Usage:
+    python cli.py validate
+    python cli.py scrape
+    python cli.py render-from-store STORE_DIR [--output report.html]
+    python cli.py catalog {earth-science,algebra-2} [--csv out.csv]
+    python cli.py serve STORE_DIR [--port 8000] [--ttl 60] [--allow-refresh]
+    python cli.py queue {enqueue,work,aggregate,status} --db QUEUE_DB [--run-id ID]
+"""
+
+import argparse
+import sys
+
+
+def _validate(args):
+    from check_credentials import check_credentials
+
+    check_credentials()
+
+
+def _scrape(args):
+    import get_stats
+
+    get_stats.main()
+
+
+def _render_from_store(args):
+    import report
+    import store
+
+    run = store.load_latest(args.store_dir)
+    if run is None:
+        print(f"No stored runs found in {args.store_dir}", file=sys.stderr)
+        return 1
+
+    html_content = report.build_report_html(run["ixl"], run["math_academy"])
+    if html_content is None:
+        print(f"Latest run from {run['created_at']} contains no data", file=sys.stderr)
+        return 1
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(html_content)
+    else:
+        print(html_content)
+    return 0
+
+
+CATALOGS = {
+    "earth-science": "earch_science_skills_data",
+    "algebra-2": "algebra2_skills_data",
+}
+
+
+def _catalog(args):
+    import ixl_skills_parse
+
+    df = getattr(ixl_skills_parse, CATALOGS[args.subject])()
+    if df is None:
+        return 1
+
+    if args.csv:
+        df.to_csv(args.csv)
+    else:
+        print(df.to_string())
+    return 0
+
+
+def _serve(args):
+    import logging
+
+    import api
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    results_api = api.ResultsAPI(args.store_dir, ttl=args.ttl, allow_refresh=args.allow_refresh)
+    server = api.make_server(results_api, args.host, args.port)
+    print(f"Serving {args.store_dir} on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
+
+
+def _queue(args):
+    import logging
+    import os
+    from datetime import UTC, datetime
+
+    import jobqueue
+
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    )
+    queue = jobqueue.WorkQueue(args.db, max_attempts=args.max_attempts)
+
+    if args.action == "enqueue":
+        names = ("IXL_USERNAME", "MATHACADEMY_USERNAME", "MATHACADEMY_STUDENT_IDS")
+        missing = [name for name in names if not os.environ.get(name)]
+        if missing:
+            print(f"Missing environment variables: {', '.join(missing)}", file=sys.stderr)
+            return 1
+        run_id = args.run_id or datetime.now(UTC).strftime("%Y-%m-%d")
+        queue.start_run(run_id)
+        # IXL students are listed by whichever worker picks up the discovery job.
+        added = queue.enqueue(run_id, "ixl", os.environ["IXL_USERNAME"], [jobqueue.DISCOVER])
+        student_ids = [
+            value.strip()
+            for value in os.environ["MATHACADEMY_STUDENT_IDS"].split(",")
+            if value.strip()
+        ]
+        added += queue.enqueue(
+            run_id, "math_academy", os.environ["MATHACADEMY_USERNAME"], student_ids
+        )
+        print(f"Enqueued {added} new jobs for run {run_id}")
+        return 0
+
+    # Later steps may run after midnight, so they default to the enqueued run, not the date.
+    run_id = args.run_id or queue.current_run()
+    if run_id is None:
+        print(f"No run has been enqueued in {args.db}", file=sys.stderr)
+        return 1
+
+    if args.action == "work":
+        worker = jobqueue.Worker(
+            queue, jobqueue.SeleniumJobRunner.from_env(), lease_seconds=args.lease
+        )
+        worker.run(run_id)
+        return 0
+
+    if args.action == "status":
+        for status, count in queue.status(run_id).items():
+            print(f"{status}: {count}")
+        for job in queue.jobs(run_id):
+            if job.status == jobqueue.FAILED:
+                print(f"failed {job.provider}/{job.student}: {job.error}")
+        return 0
+
+    import get_stats
+
+    # Check the email settings before aggregating, as get_stats.main() does before scraping.
+    send_email_enabled = os.environ.get("SEND_EMAIL", "false").lower() == "true"
+    gmail_user = gmail_app_password = None
+    recipients = []
+    if send_email_enabled:
+        try:
+            gmail_user = get_stats._require_env("GMAIL_USER")
+            gmail_app_password = get_stats._require_env("GMAIL_APP_PASSWORD")
+            recipients = get_stats._require_csv_env(
+                "RECIPIENT_EMAILS", "RECIPIENT_EMAILS must contain at least one address"
+            )
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            return 1
+
+    if queue.has_unfinished(run_id) and not args.partial:
+        print(
+            f"Run {run_id} still has unfinished jobs; pass --partial to report anyway",
+            file=sys.stderr,
+        )
+        return 1
+
+    ixl_data, math_academy_data = jobqueue.aggregate_run(queue, run_id)
+    get_stats.publish_report(
+        ixl_data,
+        math_academy_data,
+        results_store=os.environ.get("RESULTS_STORE"),
+        send_email_enabled=send_email_enabled,
+        gmail_user=gmail_user,
+        gmail_app_password=gmail_app_password,
+        recipients=recipients,
+    )
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="ixl", description="IXL and Math Academy scraper")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    validate = subparsers.add_parser("validate", help="check required environment variables")
+    validate.set_defaults(func=_validate)
+
+    scrape = subparsers.add_parser("scrape", help="scrape both sites and send the report")
+    scrape.set_defaults(func=_scrape)
+
+    render = subparsers.add_parser(
+        "render-from-store", help="render the report from the latest stored run"
+    )
+    render.add_argument("store_dir", help="directory written by scrape via RESULTS_STORE")
+    render.add_argument("--output", help="write HTML to this file instead of stdout")
+    render.set_defaults(func=_render_from_store)
+
+    catalog = subparsers.add_parser("catalog", help="print an IXL skills catalog")
+    catalog.add_argument("subject", choices=sorted(CATALOGS))
+    catalog.add_argument("--csv", help="write the catalog to this CSV file")
+    catalog.set_defaults(func=_catalog)
+
+    serve = subparsers.add_parser("serve", help="serve stored results as a local JSON API")
+    serve.add_argument("store_dir", help="directory written by scrape via RESULTS_STORE")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8000)
+    serve.add_argument("--ttl", type=float, default=60, help="seconds to cache responses")
+    serve.add_argument(
+        "--allow-refresh",
+        action="store_true",
+        help="let POST /refresh start a background scrape",
+    )
+    serve.set_defaults(func=_serve)
+
+    queue = subparsers.add_parser(
+        "queue", help="split a scrape into jobs that several workers share"
+    )
+    queue.add_argument(
+        "action",
+        choices=["enqueue", "work", "aggregate", "status"],
+        help="add the run's jobs, run a worker, send the report, or show progress",
+    )
+    queue.add_argument("--db", required=True, help="SQLite queue file, shared by all workers")
+    queue.add_argument(
+        "--run-id",
+        help="enqueue defaults to today's UTC date, the other actions to the last enqueued run",
+    )
+    queue.add_argument("--lease", type=float, default=300, help="seconds a worker holds a job")
+    queue.add_argument(
+        "--max-attempts", type=int, default=3, help="tries per job before it is marked failed"
+    )
+    queue.add_argument(
+        "--partial", action="store_true", help="aggregate even if jobs are unfinished"
+    )
+    queue.set_defaults(func=_queue)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
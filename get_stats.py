@@ -1,3 +1,4 @@
+import asyncio
 import logging
 import os
 import smtplib
@@ -6,7 +7,6 @@ from abc import ABC, abstractmethod
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
-from bs4 import BeautifulSoup
 from selenium import webdriver
 from selenium.common.exceptions import StaleElementReferenceException, TimeoutException
 from selenium.webdriver.chrome.options import Options
@@ -16,6 +16,15 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+import memory
+import pipeline
+import planner
+import report
+import sites
+import store
+
+SCRAPER_BACKENDS = ("selenium", "cdp")
+
 # Set up logging once at the module level
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -27,7 +36,48 @@ class BaseStatsScraper(ABC):
         self.driver = driver
         self.wait = WebDriverWait(self.driver, 10)
         self.logger = logging.getLogger(self.__class__.__name__)
-        self.student_data = {}
+        self.student_data = memory.SpillableDict()
+        # Called as on_student(student_name, data) once a student is fully extracted.
+        self.on_student = None
+        self.memory_monitor = None
+        self.credentials = None
+        # Without a budget the planner never skips work; main() installs one with a deadline.
+        self.planner = planner.RunPlanner()
+
+    def student_done(self, student_name):
+        if self.on_student and student_name in self.student_data:
+            self.on_student(student_name, self.student_data[student_name])
+        if self.memory_monitor:
+            self.check_memory(student_name)
+
+    def check_memory(self, student_name):
+        python_mb, browser_mb = self.memory_monitor.sample(
+            f"{self.__class__.__name__} student {student_name}", browser_pid(self.driver)
+        )
+        if not self.memory_monitor.over_ceiling(python_mb, browser_mb):
+            return
+        self.logger.warning(
+            f"Memory ceiling of {self.memory_monitor.ceiling_mb} MB exceeded; "
+            "spilling student data to disk"
+        )
+        self.student_data.spill()
+        if self.memory_monitor.recycle_due():
+            self.logger.warning("Recycling the driver to release browser memory")
+            self.recycle_driver()
+            self.memory_monitor.record_recycle()
+
+    def recycle_driver(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error quitting driver during recycle: {e!s}")
+        self.driver = setup_driver()
+        self.wait = WebDriverWait(self.driver, 10)
+        self.restore_session()
+
+    def restore_session(self):
+        """Log the fresh driver back in after a recycle."""
+        self.login(*self.credentials)
 
     def find_element(self, by, value, timeout=10):
         try:
@@ -63,24 +113,17 @@ class BaseStatsScraper(ABC):
         pass
 
 
-class IXLStatsScraper(BaseStatsScraper):
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.login_url = "https://www.ixl.com/analytics/student-usage#"
-
+class IXLStatsScraper(sites.IXLSite, BaseStatsScraper):
     def login(self, username, password):
         try:
             self.driver.get(self.login_url)
-            self.find_element(By.ID, "qlusername").send_keys(username)
-            self.find_element(By.ID, "qlpassword").send_keys(password)
-            self.click_element(By.ID, "qlsubmit")
+            self.find_element(*self.USERNAME).send_keys(username)
+            self.find_element(*self.PASSWORD).send_keys(password)
+            self.click_element(*self.SUBMIT)
             self.logger.info("Successfully logged in to IXL")
 
-            self.find_element(By.CSS_SELECTOR, "label[data-cy^='subaccount-selection-']")
-            parent_subaccount = self.find_element(
-                By.XPATH,
-                "//label[contains(@data-cy, 'subaccount-selection-') and .//span[text()='Parent']]",
-            )
+            self.find_element(*self.SUBACCOUNTS)
+            parent_subaccount = self.find_element(*self.PARENT_SUBACCOUNT)
             parent_subaccount.click()
             self.logger.info("Selected 'Parent' subaccount")
 
@@ -91,15 +134,11 @@ class IXLStatsScraper(BaseStatsScraper):
 
     def select_date_range(self, option="Today"):
         try:
-            self.find_element(By.CSS_SELECTOR, ".date-range")
-            self.click_element(By.CSS_SELECTOR, ".date-range .option-select.global .select-open")
-            self.find_element(By.CSS_SELECTOR, ".date-range .select-body")
-            self.click_element(By.XPATH, f"//div[@class='option' and contains(text(), '{option}')]")
-            self.wait.until(
-                EC.text_to_be_present_in_element(
-                    (By.CSS_SELECTOR, ".date-range .option-selection"), option
-                )
-            )
+            self.find_element(*self.DATE_RANGE)
+            self.click_element(*self.DATE_RANGE_OPEN)
+            self.find_element(*self.DATE_RANGE_BODY)
+            self.click_element(*self.date_range_option(option))
+            self.wait.until(EC.text_to_be_present_in_element(self.DATE_RANGE_SELECTION, option))
             self.logger.info(f"Selected date range: {option}")
         except Exception as e:
             self.logger.error(f"Failed to select date range: {e!s}")
@@ -107,12 +146,15 @@ class IXLStatsScraper(BaseStatsScraper):
             raise
 
     def get_student_options(self):
-        self.click_element(By.CSS_SELECTOR, ".student-select .option-select.global .select-open")
-        self.find_element(By.CSS_SELECTOR, ".student-select .select-body")
-        return self.driver.find_elements(
-            By.CSS_SELECTOR,
-            ".option-select.global.default.active .select-dropdown .option",
-        )
+        self.click_element(*self.STUDENT_SELECT_OPEN)
+        self.find_element(*self.STUDENT_SELECT_BODY)
+        return self.driver.find_elements(By.CSS_SELECTOR, self.STUDENT_OPTIONS)
+
+    def get_student_names(self):
+        return [
+            option.get_attribute(self.STUDENT_NAME_ATTRIBUTE)
+            for option in self.get_student_options()
+        ]
 
     def select_student(self, student_name):
         max_attempts = 3
@@ -120,13 +162,10 @@ class IXLStatsScraper(BaseStatsScraper):
             try:
                 student_options = self.get_student_options()
                 for student in student_options:
-                    if student.get_attribute("data-name") == student_name:
+                    if student.get_attribute(self.STUDENT_NAME_ATTRIBUTE) == student_name:
                         student.click()
                         self.wait.until(
-                            EC.text_to_be_present_in_element(
-                                (By.CSS_SELECTOR, ".student-select .option-selection"),
-                                student_name,
-                            )
+                            EC.text_to_be_present_in_element(self.STUDENT_SELECTION, student_name)
                         )
                         return True
                 continue
@@ -142,126 +181,71 @@ class IXLStatsScraper(BaseStatsScraper):
                     )
                     return False
 
-    @staticmethod
-    def process_table_html(table_html):
-        soup = BeautifulSoup(table_html, "html.parser")
-
-        # Create a new table
-        new_table = soup.new_tag("table")
-        new_table["style"] = "border-collapse: collapse; width: 100%;"
-
-        # Add header row
-        header = soup.new_tag("tr")
-        headers = [
-            "Subject/Category/Skill",
-            "Code",
-            "Time Spent",
-            "#",
-            "Score Improvement",
-        ]
-        for h in headers:
-            th = soup.new_tag("th")
-            th.string = h
-            th["style"] = "border: 1px solid #ddd; padding: 8px; background-color: #f2f2f2;"
-            header.append(th)
-        new_table.append(header)
-
-        # Process rows
-        for row in soup.select('div[class*="row"]'):
-            new_row = soup.new_tag("tr")
-
-            row_classes = row.get("class")
-            if isinstance(row_classes, list) and "subject-grade-row" in row_classes:
-                td = soup.new_tag("td")
-                td.string = row.get_text().strip()
-                td["colspan"] = "5"
-                td["style"] = (
-                    "border: 1px solid #ddd; padding: 8px; font-weight: bold; background-color: #e6e6e6;"
-                )
-                new_row.append(td)
-            elif isinstance(row_classes, list) and "category-row" in row_classes:
-                td = soup.new_tag("td")
-                td.string = row.get_text().strip()
-                td["colspan"] = "5"
-                td["style"] = (
-                    "border: 1px solid #ddd; padding: 8px; font-style: italic; background-color: #f9f9f9;"
-                )
-                new_row.append(td)
-            elif isinstance(row_classes, list) and "skill-row" in row_classes:
-                score_cells = row.select(".skill-improvement .score")
-                plain_cells = [
-                    row.select_one(".skill-name-and-permacode span"),
-                    row.select_one(".permacode"),
-                    row.select_one(".skill-time"),
-                    row.select_one(".skill-questions"),
-                ]
-
-                for cell in plain_cells:
-                    td = soup.new_tag("td")
-                    td["style"] = "border: 1px solid #ddd; padding: 8px;"
-                    td.string = cell.get_text().strip() if cell else "N/A"
-                    new_row.append(td)
-
-                score_td = soup.new_tag("td")
-                score_td["style"] = "border: 1px solid #ddd; padding: 8px;"
-                score_td.string = (
-                    f"{score_cells[0].get_text()} to {score_cells[1].get_text()}"
-                    if len(score_cells) == 2
-                    else "N/A"
-                )
-                new_row.append(score_td)
-
-            new_table.append(new_row)
+    process_table_html = staticmethod(report.process_table_html)
 
-        return str(new_table)
-
-    def process_student_data(self, student_id: str) -> None:
+    def process_student_data(self, student_id: str) -> bool:
+        """Record the summary stats and return whether there is progress to fetch."""
         student_name = student_id
         try:
-            time.sleep(3)
-            stats_element = self.find_element(By.CSS_SELECTOR, ".summary-stat-container")
-            stats_text = " ".join(stats_element.text.split())
-            self.logger.info(f"IXL Stats for {student_name}: {stats_text.lower()}")
-            self.student_data[student_name] = {"stats": stats_text.lower()}
-
-            # Check if progress report is needed
-            if (
-                "answered 0 questions spent 0 min practicing made progress in 0 skills"
-                not in stats_text.lower()
-            ):
-                self.get_progress_and_improvement_data(student_name)
-            else:
-                self.logger.info(f"No progress to report for {student_name}")
+            time.sleep(self.settle_delay)
+            stats_element = self.find_element(*self.SUMMARY_STATS)
+            return self.record_summary(student_name, stats_element.text)
 
         except Exception as e:
             self.logger.error(f"Error processing IXL data for {student_name}: {e!s}")
+            return False
+
+    def collect_progress(self, student_name):
+        try:
+            self.get_progress_and_improvement_data(student_name)
+        except Exception as e:
+            self.logger.error(f"Error processing IXL data for {student_name}: {e!s}")
+
+    def run_step(self, step, student_name, sections):
+        """Carry out one step from ``planner.ixl_steps`` and return its outcome."""
+        if step == planner.SELECT:
+            self.logger.info(f"Processing IXL student: {student_name}")
+            selected = self.select_student(student_name)
+            if not selected:
+                self.logger.warning(f"Failed to select IXL student: {student_name}")
+            return selected
+        if step == planner.SUMMARY:
+            return self.process_student_data(student_name)
+        if step == planner.DETAIL:
+            self.collect_progress(student_name)
+        elif step == planner.SKIP:
+            self.skip_sections(student_name, sections)
+        elif step == planner.FINISH:
+            self.student_done(student_name)
+        return None
+
+    def scrape_students(self, student_names):
+        """Scrape students on the logged-in usage page in the order ``self.planner`` picks."""
+        steps = planner.Steps(planner.ixl_steps(self.planner, student_names))
+        for step in steps:
+            steps.outcome = self.run_step(*step)
 
     def get_progress_and_improvement_data(self, student_name):
         try:
-            self.driver.get("https://www.ixl.com/analytics/progress-and-improvement")
+            self.driver.get(self.progress_url)
             self.logger.info(f"Navigated to Progress and Improvement page for {student_name}")
-            time.sleep(3)
-
-            table = self.find_element(By.CSS_SELECTOR, ".student-improvement-table")
-            table_html = table.get_attribute("outerHTML")
-            self.student_data[student_name]["progress_table"] = table_html
-
-            rows = table.find_elements(By.CSS_SELECTOR, ".skill-row")
-            for row in rows:
-                skill_name = row.find_element(
-                    By.CSS_SELECTOR, ".skill-name-and-permacode span"
-                ).text
-                skill_code = row.find_element(By.CSS_SELECTOR, ".permacode").text
-                time_spent = row.find_element(By.CSS_SELECTOR, ".skill-time").text
-                questions = row.find_element(By.CSS_SELECTOR, ".skill-questions").text
-                scores = [
-                    x.text for x in row.find_elements(By.CSS_SELECTOR, ".skill-improvement .score")
-                ]
-                score_from = scores[0] if scores else "N/A"
-                score_to = scores[1] if len(scores) > 1 else "N/A"
-
-                log_message = f"{student_name} - Skill: {skill_name} ({skill_code}), Time: {time_spent}, Questions: {questions}, Improvement: {score_from} to {score_to}"
-                self.logger.info(log_message)
+            time.sleep(self.settle_delay)
+
+            table = self.find_element(*self.PROGRESS_TABLE)
+            rows = [
+                {
+                    **{
+                        field: row.find_element(By.CSS_SELECTOR, selector).text
+                        for field, selector in self.SKILL_FIELDS
+                    },
+                    "scores": [
+                        score.text
+                        for score in row.find_elements(By.CSS_SELECTOR, self.SKILL_SCORES)
+                    ],
+                }
+                for row in self.driver.find_elements(By.CSS_SELECTOR, self.SKILL_ROWS)
+            ]
+            self.record_progress(student_name, table.get_attribute("outerHTML"), rows)
 
             self.driver.get(self.login_url)
             self.logger.info(f"Navigated back to main analytics page for {student_name}")
@@ -273,44 +257,36 @@ class IXLStatsScraper(BaseStatsScraper):
             self.driver.save_screenshot(f"ixl_progress_improvement_error_{student_name}.png")
             raise
 
+    def restore_session(self):
+        super().restore_session()
+        self.select_date_range("Today")
+
     def get_stats(self, username, password):
         try:
+            self.credentials = (username, password)
             self.login(username, password)
             self.select_date_range("Today")
 
-            student_options = self.get_student_options()
-            student_names = [student.get_attribute("data-name") for student in student_options]
-
-            for student_name in student_names:
-                self.logger.info(f"Processing IXL student: {student_name}")
-                if self.select_student(student_name):
-                    self.process_student_data(student_name)
-                else:
-                    self.logger.warning(f"Failed to select IXL student: {student_name}")
+            self.scrape_students(self.get_student_names())
 
         except Exception as e:
             self.logger.error(f"An error occurred during IXL stats collection: {e!s}")
 
 
-class MathAcademyStatsScraper(BaseStatsScraper):
-    def __init__(self, driver):
-        super().__init__(driver)
-        self.login_url = "https://mathacademy.com/login"
-        self.base_activity_url = "https://mathacademy.com/students/{}/activity"
-
+class MathAcademyStatsScraper(sites.MathAcademySite, BaseStatsScraper):
     def login(self, username, password):
         try:
             self.driver.get(self.login_url)
 
-            username_field = self.find_element(By.ID, "usernameOrEmail")
+            username_field = self.find_element(*self.USERNAME)
             username_field.clear()
             username_field.send_keys(username)
 
-            password_field = self.find_element(By.ID, "password")
+            password_field = self.find_element(*self.PASSWORD)
             password_field.clear()
             password_field.send_keys(password)
 
-            self.click_element(By.ID, "loginButton")
+            self.click_element(*self.LOGIN_BUTTON)
 
             WebDriverWait(self.driver, 10).until(EC.url_changes(self.login_url))
 
@@ -322,112 +298,50 @@ class MathAcademyStatsScraper(BaseStatsScraper):
 
     def process_student_data(self, student_id):
         try:
-            activity_url = self.base_activity_url.format(student_id)
-            self.driver.get(activity_url)
-
-            # Get student name
-            student_name_element = self.find_element(By.ID, "studentName")
-            student_name = student_name_element.text.strip()
-
-            # Extract daily and weekly XP
-            daily_xp_element = self.find_element(By.ID, "dailyGoalPoints")
-            daily_xp_text = daily_xp_element.text.strip()
-            daily_xp_earned, daily_xp_goal = (
-                daily_xp_text.split("/")[0],
-                daily_xp_text.split("/")[1].split()[0],
-            )
-
-            weekly_xp_element = self.find_element(By.ID, "thisWeekTotalXP")
-            weekly_xp = weekly_xp_element.text.split()[0]
-
-            # Extract activity report
-            activity_element = self.find_element(By.ID, "tasksFrame")
-            activity_html = activity_element.get_attribute("outerHTML")
-
-            self.student_data[student_name] = {
-                "student_id": student_id,
-                "daily_xp_earned": daily_xp_earned,
-                "daily_xp_goal": daily_xp_goal,
-                "weekly_xp": weekly_xp,
-                "activity_html": activity_html,
-            }
-
-            self.logger.info(
-                f"Processed Math Academy data for student: {student_name} (ID: {student_id})"
+            self.driver.get(self.base_activity_url.format(student_id))
+            student_name, data = self.student_entry(
+                student_id,
+                self.find_element(*self.STUDENT_NAME).text,
+                self.find_element(*self.DAILY_XP).text,
+                self.find_element(*self.WEEKLY_XP).text,
+                self.find_element(*self.ACTIVITY).get_attribute("outerHTML"),
             )
+            self.student_data[student_name] = data
+            self.student_done(student_name)
         except Exception as e:
             self.logger.error(
                 f"Error processing Math Academy data for student ID {student_id}: {e!s}"
             )
             self.driver.save_screenshot(f"math_academy_student_{student_id}_error.png")
 
-    @staticmethod
-    def parse_activity_html(activity_html):
-        soup = BeautifulSoup(activity_html, "html.parser")
-        parsed_data = []
-        date_count = 0
-
-        for tr in soup.find_all("tr"):
-            if not tr.get("class"):
-                date_td = tr.find("td", class_="dateHeader")
-                if date_td:
-                    date_count += 1
-                    if date_count >= 3:
-                        break  # Stop parsing after the second date row
-                    xp_span = date_td.find("span", class_="dateTotalXP")
-                    xp = xp_span.get_text(strip=True) if xp_span else ""
-
-                    # Remove the XP span from the date_td to get the date
-                    if xp_span:
-                        xp_span.extract()
-                    date = date_td.get_text(strip=True)
-                    parsed_data.append({"type": "date", "date": date, "xp": xp})
-            elif date_count < 3:  # Only parse task rows before the third date row
-                task_type_td = tr.find("td", class_="taskTypeColumn")
-                task_name_div = tr.find("div", class_="taskName")
-                completion_td = tr.find("td", class_="taskCompletedColumn")
-                points_span = tr.find("span", class_="taskPoints") or tr.find(
-                    "span", class_="completedTaskPoints"
-                )
-
-                parsed_data.append(
-                    {
-                        "type": "task",
-                        "task_type": (task_type_td.get_text(strip=True) if task_type_td else ""),
-                        "task_name": (task_name_div.get_text(strip=True) if task_name_div else ""),
-                        "completion": (completion_td.get_text(strip=True) if completion_td else ""),
-                        "points": (points_span.get_text(strip=True) if points_span else ""),
-                    }
-                )
-
-        return parsed_data
-
-    @staticmethod
-    def format_activity_html(parsed_data):
-        html = "<table border='1' style='border-collapse: collapse; width: 100%;'>"
-        html += "<tr style='background-color: #f2f2f2;'><th>Type</th><th>Name</th><th>Completion</th><th>Points</th></tr>"
-
-        for item in parsed_data:
-            if item["type"] == "date":
-                html += "<tr style='background-color: #e6e6e6;'>"
-                html += f"<td colspan='4'><strong>{item['date']} - {item['xp']}</strong></td></tr>"
-            else:
-                html += f"<tr><td>{item['task_type']}</td><td>{item['task_name']}</td><td>{item['completion']}</td><td>{item['points']}</td></tr>"
-
-        html += "</table>"
-        return html
+    parse_activity_html = staticmethod(report.parse_activity_html)
+    format_activity_html = staticmethod(report.format_activity_html)
 
     def get_stats(self, username, password, student_ids):
         try:
+            self.credentials = (username, password)
             self.login(username, password)
 
-            for student_id in student_ids:
-                self.process_student_data(student_id)
+            for student_id in self.planner.plan("math_academy", student_ids):
+                if not self.planner.start_summary("math_academy", student_id):
+                    key, data = self.skipped_entry(student_id)
+                    self.student_data[key] = data
+                    self.student_done(key)
+                    continue
+                with self.planner.timed("math_academy", student_id, planner.SUMMARY):
+                    self.process_student_data(student_id)
 
         except Exception as e:
             self.logger.error(f"An error occurred during Math Academy stats collection: {e!s}")
 
 
+def browser_pid(driver):
+    """Return the chromedriver PID; Chrome and its renderers are its descendants."""
+    service = getattr(driver, "service", None)
+    process = getattr(service, "process", None)
+    return process.pid if process else None
+
+
 def setup_driver():
     chrome_options = Options()
     headless_mode = os.environ.get("HEADLESS", "true").lower() == "true"
@@ -468,6 +382,98 @@ def send_email(
         logging.error(f"Failed to send email: {e!s}")
 
 
+def scrape_with_selenium(
+    ixl_username,
+    ixl_password,
+    mathacademy_username,
+    mathacademy_password,
+    mathacademy_student_ids,
+    on_student=None,
+    run_planner=None,
+):
+    """Scrape both sites, one after the other, with one Selenium driver.
+
+    See ``sites.Site.attach`` for ``on_student`` and ``run_planner``. Memory is
+    sampled after every student; above ``MEMORY_CEILING_MB`` the scraper spills
+    its data to disk and replaces the driver.
+    """
+    run_planner = planner.for_scrape(run_planner, mathacademy_student_ids)
+    logger = logging.getLogger(__name__)
+    ceiling = os.environ.get("MEMORY_CEILING_MB")
+    memory_monitor = memory.MemoryMonitor(float(ceiling) if ceiling else None)
+    ixl_data = {}
+    math_academy_data = {}
+
+    ixl_scraper = IXLStatsScraper(setup_driver())
+    ixl_scraper.attach(run_planner, memory_monitor, on_student)
+    # Scrapers may recycle the driver, so always hand over and quit the current one.
+    scraper = ixl_scraper
+
+    try:
+        # IXL scraping
+        try:
+            ixl_scraper.get_stats(ixl_username, ixl_password)
+            ixl_data = ixl_scraper.student_data
+            logger.info("IXL scraping completed successfully")
+        except Exception as e:
+            logger.error(f"Error during IXL scraping: {e!s}")
+
+        # Math Academy scraping
+        try:
+            math_academy_scraper = MathAcademyStatsScraper(ixl_scraper.driver)
+            math_academy_scraper.attach(run_planner, memory_monitor, on_student)
+            scraper = math_academy_scraper
+            math_academy_scraper.get_stats(
+                mathacademy_username,
+                mathacademy_password,
+                mathacademy_student_ids,
+            )
+            math_academy_data = math_academy_scraper.student_data
+            logger.info("Math Academy scraping completed successfully")
+        except Exception as e:
+            logger.error(f"Error during Math Academy scraping: {e!s}")
+    finally:
+        scraper.driver.quit()
+        memory_monitor.log_peak()
+
+    return ixl_data, math_academy_data
+
+
+def publish_report(
+    ixl_data,
+    math_academy_data,
+    rendered=None,
+    *,
+    results_store,
+    send_email_enabled,
+    gmail_user,
+    gmail_app_password,
+    recipients,
+):
+    """Save the raw results, build the HTML report and email it if enabled."""
+    logger = logging.getLogger(__name__)
+
+    if results_store and (ixl_data or math_academy_data):
+        path = store.save_run(results_store, ixl_data, math_academy_data)
+        logger.info(f"Saved raw results to {path}")
+
+    # Prepare and send email
+    html_content = report.build_report_html(ixl_data, math_academy_data, rendered)
+    if html_content is not None:
+        if send_email_enabled:
+            send_email(
+                "IXL and Math Academy Progress Report",
+                html_content,
+                gmail_user,
+                gmail_app_password,
+                recipients,
+            )
+        else:
+            logger.info("skipping sending email")
+    else:
+        logger.warning("No data collected from either IXL or Math Academy. No email sent.")
+
+
 def _require_env(name):
     value = os.environ.get(name)
     if not value:
@@ -500,78 +506,68 @@ def main():
     )
 
     send_email_enabled = os.environ.get("SEND_EMAIL", "false").lower() == "true"
-
-    driver = setup_driver()
-    ixl_data = {}
-    math_academy_data = {}
+    results_store = os.environ.get("RESULTS_STORE")
+    scraper_backend = os.environ.get("SCRAPER_BACKEND", "selenium").lower()
+    if scraper_backend not in SCRAPER_BACKENDS:
+        raise ValueError(f"SCRAPER_BACKEND must be one of: {', '.join(SCRAPER_BACKENDS)}")
+    if scraper_backend == "cdp" and os.environ.get("MEMORY_CEILING_MB"):
+        # The cdp backend shares one browser between concurrent tabs and cannot restart it.
+        raise ValueError("MEMORY_CEILING_MB is only supported with SCRAPER_BACKEND=selenium")
+    render_pipeline = pipeline.RenderPipeline(
+        workers=int(os.environ.get("RENDER_WORKERS", "2")),
+        max_pending=int(os.environ.get("RENDER_QUEUE_SIZE", "8")),
+        executor=os.environ.get("RENDER_EXECUTOR", "thread").lower(),
+    )
+    budget = os.environ.get("RUN_TIME_BUDGET_SECONDS")
+    history_path = os.environ.get("PLANNER_HISTORY_PATH") or (
+        os.path.join(results_store, "planner_history.json") if results_store else None
+    )
+    run_planner = planner.RunPlanner(
+        budget_seconds=float(budget) if budget else None, history_path=history_path
+    )
 
     try:
-        # IXL scraping
-        try:
-            ixl_scraper = IXLStatsScraper(driver)
-            ixl_scraper.get_stats(ixl_username, ixl_password)
-            ixl_data = ixl_scraper.student_data
-            logger.info("IXL scraping completed successfully")
-        except Exception as e:
-            logger.error(f"Error during IXL scraping: {e!s}")
-
-        # Math Academy scraping
-        try:
-            math_academy_scraper = MathAcademyStatsScraper(driver)
-            math_academy_scraper.get_stats(
+        if scraper_backend == "cdp":
+            import cdp_scrapers
+
+            ixl_data, math_academy_data = asyncio.run(
+                cdp_scrapers.scrape_all(
+                    ixl_username,
+                    ixl_password,
+                    mathacademy_username,
+                    mathacademy_password,
+                    mathacademy_student_ids,
+                    on_student=render_pipeline.put,
+                    run_planner=run_planner,
+                )
+            )
+        else:
+            ixl_data, math_academy_data = scrape_with_selenium(
+                ixl_username,
+                ixl_password,
                 mathacademy_username,
                 mathacademy_password,
                 mathacademy_student_ids,
+                on_student=render_pipeline.put,
+                run_planner=run_planner,
             )
-            math_academy_data = math_academy_scraper.student_data
-            logger.info("Math Academy scraping completed successfully")
-        except Exception as e:
-            logger.error(f"Error during Math Academy scraping: {e!s}")
-
-        # Prepare and send email
-        if ixl_data or math_academy_data:
-            html_content = "<html><body>"
-            if ixl_data:
-                # IXL Report
-                html_content += "<h2>IXL</h2>"
-                for student_name, data in ixl_data.items():
-                    html_content += f"<h3>{student_name} {data['stats']}</h3>"
-                    if "progress_table" in data:
-                        html_content += IXLStatsScraper.process_table_html(data["progress_table"])
-
-            if math_academy_data:
-                # Math Academy Report
-                html_content += "<h2>Math Academy</h2>"
-                for student_name, data in math_academy_data.items():
-                    html_content += f"<h3>{student_name}: today {data['daily_xp_earned']}/{data['daily_xp_goal']} XP, this week {data['weekly_xp']} XP</h3>"
-
-                    parsed_activity = MathAcademyStatsScraper.parse_activity_html(
-                        data["activity_html"]
-                    )
-                    formatted_activity = MathAcademyStatsScraper.format_activity_html(
-                        parsed_activity
-                    )
-                    html_content += formatted_activity
-
-            html_content += "</body></html>"
-
-            if send_email_enabled:
-                send_email(
-                    "IXL and Math Academy Progress Report",
-                    html_content,
-                    gmail_user,
-                    gmail_app_password,
-                    recipients,
-                )
-            else:
-                logger.info("skipping sending email")
-        else:
-            logger.warning("No data collected from either IXL or Math Academy. No email sent.")
-
+        rendered = render_pipeline.close()
+        run_planner.save()
+
+        publish_report(
+            ixl_data,
+            math_academy_data,
+            rendered,
+            results_store=results_store,
+            send_email_enabled=send_email_enabled,
+            gmail_user=gmail_user,
+            gmail_app_password=gmail_app_password,
+            recipients=recipients,
+        )
     except Exception as e:
         logger.error(f"An unexpected error occurred: {e!s}")
     finally:
-        driver.quit()
+        render_pipeline.close()
         logger.info("Script execution completed.")
 
 
@@ -1,6 +1,12 @@
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# pandas, requests and bs4 are imported inside the functions that use them so that
+# importing this module (e.g. to list catalog commands) does not pay their startup cost.
 
 
 def get_codes_from_ixl(url: str) -> pd.DataFrame | None:
@@ -11,6 +17,10 @@ def get_codes_from_ixl(url: str) -> pd.DataFrame | None:
     Returns:
         A DataFrame containing the skills data, or None if an error occurred.
     """
+    import pandas as pd
+    import requests
+    from bs4 import BeautifulSoup
+
     # Headers to mimic browser request
     headers = {
         "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
@@ -0,0 +1,434 @@
+"""Durable SQLite work queue for sharing one scrape between several workers.
+
+A run is a set of ``(provider, tenant, student)`` jobs, where ``tenant`` is the
+provider account the student belongs to. Workers, possibly on different hosts
+sharing the database file, lease one job at a time, renew the lease with
+heartbeats while they work and write the student's data back as the result.
+A lease that runs out (the worker died or lost the volume) makes the job
+claimable again; a job that keeps failing is marked failed after
+``max_attempts``. Enqueueing is idempotent, so re-running ``enqueue`` and
+``work`` for the same run only picks up what is not done yet.
+
+IXL students are only known after logging in, so IXL is enqueued as a single
+discovery job (student ``*``) whose worker enqueues one job per student.
+"""
+
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from contextlib import closing, contextmanager
+
+import planner
+
+DISCOVER = "*"
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+STATUSES = (PENDING, LEASED, DONE, FAILED)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    run_id TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    tenant TEXT NOT NULL,
+    student TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL,
+    lease_owner TEXT,
+    lease_expires_at REAL,
+    result TEXT,
+    error TEXT,
+    updated_at REAL NOT NULL,
+    UNIQUE (run_id, provider, tenant, student)
+);
+"""
+
+
+class Job:
+    def __init__(self, id, run_id, provider, tenant, student, status, attempts, result, error):
+        self.id = id
+        self.run_id = run_id
+        self.provider = provider
+        self.tenant = tenant
+        self.student = student
+        self.status = status
+        self.attempts = attempts
+        self.result = None if result is None else json.loads(result)
+        self.error = error
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.provider}/{self.tenant}/{self.student}, {self.status})"
+
+
+_JOB_COLUMNS = "id, run_id, provider, tenant, student, status, attempts, result, error"
+
+
+class WorkQueue:
+    def __init__(self, path, max_attempts=3, clock=time.time):
+        self.path = path
+        self.max_attempts = max_attempts
+        # Leases are compared across hosts, so this must be wall-clock time.
+        self.clock = clock
+        with self._transaction() as conn:
+            for statement in _SCHEMA.split(";"):
+                conn.execute(statement)
+
+    @contextmanager
+    def _transaction(self):
+        # A short-lived connection per operation keeps no locks or file handles open
+        # between calls. The default rollback journal is used rather than WAL, which
+        # needs shared memory and does not work across hosts on a network volume.
+        with closing(sqlite3.connect(self.path, timeout=30, isolation_level=None)) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def start_run(self, run_id):
+        """Make ``run_id`` the current run, which workers and aggregation default to."""
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO runs (run_id, started_at) VALUES (?, ?)"
+                " ON CONFLICT (run_id) DO UPDATE SET started_at = excluded.started_at",
+                (run_id, self.clock()),
+            )
+
+    def current_run(self):
+        """Return the run most recently passed to ``start_run``, or None."""
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT run_id FROM runs ORDER BY started_at DESC, rowid DESC LIMIT 1"
+            ).fetchone()
+        return row and row[0]
+
+    def enqueue(self, run_id, provider, tenant, students):
+        """Add a job per student, ignoring ones the run already has. Returns how many were new."""
+        now = self.clock()
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO jobs"
+                " (run_id, provider, tenant, student, max_attempts, updated_at)"
+                " VALUES (?, ?, ?, ?, ?, ?)",
+                [(run_id, provider, tenant, s, self.max_attempts, now) for s in students],
+            )
+            return conn.total_changes - before
+
+    def claim(self, run_id, worker_id, lease_seconds, accounts=None):
+        """Lease the next runnable job, or return None.
+
+        ``accounts`` limits the claim to ``(provider, tenant)`` pairs the worker
+        has credentials for. Discovery jobs go first so their students can be
+        spread over the other workers.
+        """
+        now = self.clock()
+        account_filter, params = _account_filter(accounts)
+        with self._transaction() as conn:
+            # Jobs whose last lease ran out on the final attempt are not retried again.
+            conn.execute(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, updated_at = ?,"
+                " error = COALESCE(error, 'lease expired')"
+                " WHERE run_id = ? AND status = ? AND lease_expires_at < ?"
+                " AND attempts >= max_attempts",
+                (FAILED, now, run_id, LEASED, now),
+            )
+            row = conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs"
+                " WHERE run_id = ? AND (status = ? OR (status = ? AND lease_expires_at < ?))"
+                f"{account_filter} ORDER BY student = ? DESC, id LIMIT 1",
+                (run_id, PENDING, LEASED, now, *params, DISCOVER),
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?,"
+                " lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                (LEASED, worker_id, now + lease_seconds, now, row[0]),
+            )
+        job = Job(*row)
+        job.status = LEASED
+        job.attempts += 1
+        return job
+
+    def heartbeat(self, job_id, worker_id, lease_seconds):
+        """Extend a lease. Returns False if the worker no longer holds it."""
+        now = self.clock()
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ?"
+                " WHERE id = ? AND status = ? AND lease_owner = ?",
+                (now + lease_seconds, now, job_id, LEASED, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def complete(self, job_id, worker_id, result):
+        """Store a job's result. Returns False if the lease was lost to another worker."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_owner = NULL,"
+                " updated_at = ? WHERE id = ? AND status = ? AND lease_owner = ?",
+                (DONE, json.dumps(result), self.clock(), job_id, LEASED, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def fail(self, job_id, worker_id, error):
+        """Release a job after an error: back to pending, or failed once out of attempts."""
+        with self._transaction() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET"
+                " status = CASE WHEN attempts >= max_attempts THEN ? ELSE ? END,"
+                " error = ?, lease_owner = NULL, lease_expires_at = NULL, updated_at = ?"
+                " WHERE id = ? AND status = ? AND lease_owner = ?",
+                (FAILED, PENDING, error, self.clock(), job_id, LEASED, worker_id),
+            )
+            return cursor.rowcount == 1
+
+    def has_unfinished(self, run_id, accounts=None):
+        account_filter, params = _account_filter(accounts)
+        with self._transaction() as conn:
+            row = conn.execute(
+                f"SELECT 1 FROM jobs WHERE run_id = ? AND status IN (?, ?){account_filter} LIMIT 1",
+                (run_id, PENDING, LEASED, *params),
+            ).fetchone()
+        return row is not None
+
+    def jobs(self, run_id):
+        """Return every job of a run in the order it was enqueued."""
+        with self._transaction() as conn:
+            rows = conn.execute(
+                f"SELECT {_JOB_COLUMNS} FROM jobs WHERE run_id = ? ORDER BY id", (run_id,)
+            ).fetchall()
+        return [Job(*row) for row in rows]
+
+    def status(self, run_id):
+        """Return the number of jobs of a run in each status."""
+        counts = dict.fromkeys(STATUSES, 0)
+        with self._transaction() as conn:
+            for status, count in conn.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE run_id = ? GROUP BY status", (run_id,)
+            ):
+                counts[status] = count
+        return counts
+
+
+def _account_filter(accounts):
+    if accounts is None:
+        return "", ()
+    accounts = list(accounts)
+    if not accounts:
+        return " AND 0", ()
+    clause = " OR ".join("(provider = ? AND tenant = ?)" for _ in accounts)
+    return f" AND ({clause})", tuple(value for account in accounts for value in account)
+
+
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class Worker:
+    """Pulls jobs for the runner's accounts until none of them is left unfinished.
+
+    ``runner`` provides ``accounts`` (``(provider, tenant)`` pairs), ``discover``,
+    ``run`` (returns ``{student_name: data}``), ``reset(provider, tenant)`` and ``close``.
+    """
+
+    def __init__(self, queue, runner, worker_id=None, lease_seconds=300, poll_interval=5):
+        self.queue = queue
+        self.runner = runner
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    def run(self, run_id):
+        """Work through the run and return the number of jobs this worker completed."""
+        accounts = list(self.runner.accounts)
+        completed = 0
+        try:
+            while True:
+                job = self.queue.claim(run_id, self.worker_id, self.lease_seconds, accounts)
+                if job is None:
+                    # Other workers may still hold leases that could expire or add students.
+                    if not self.queue.has_unfinished(run_id, accounts):
+                        break
+                    time.sleep(self.poll_interval)
+                    continue
+                if self.process(job):
+                    completed += 1
+        finally:
+            self.runner.close()
+        self.logger.info(f"Worker {self.worker_id} completed {completed} jobs of run {run_id}")
+        return completed
+
+    def process(self, job):
+        self.logger.info(f"Worker {self.worker_id} running {job!r} (attempt {job.attempts})")
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self._heartbeat, args=(job, stop), name=f"heartbeat-{job.id}", daemon=True
+        )
+        heartbeat.start()
+        try:
+            if job.student == DISCOVER:
+                result = self.runner.discover(job.provider, job.tenant)
+                added = self.queue.enqueue(job.run_id, job.provider, job.tenant, result)
+                self.logger.info(f"Discovered {len(result)} {job.provider} students, {added} new")
+            else:
+                result = self.runner.run(job.provider, job.tenant, job.student)
+        except Exception as e:
+            self.logger.error(f"{job!r} failed on attempt {job.attempts}: {e!s}")
+            self.queue.fail(job.id, self.worker_id, str(e))
+            # The account's browser may be in any state after an error, so start it afresh.
+            self.runner.reset(job.provider, job.tenant)
+            return False
+        finally:
+            stop.set()
+            heartbeat.join()
+
+        if not self.queue.complete(job.id, self.worker_id, result):
+            self.logger.warning(f"Lease on {job!r} was lost; discarding its result")
+            return False
+        return True
+
+    def _heartbeat(self, job, stop):
+        while not stop.wait(self.lease_seconds / 3):
+            try:
+                if not self.queue.heartbeat(job.id, self.worker_id, self.lease_seconds):
+                    self.logger.warning(f"Lease on {job!r} was lost")
+                    return
+            except sqlite3.Error as e:
+                self.logger.warning(f"Heartbeat for {job!r} failed: {e!s}")
+
+
+class SeleniumJobRunner:
+    """Runs jobs with the Selenium scrapers, keeping one logged-in driver per account."""
+
+    def __init__(self, credentials):
+        # {(provider, tenant): (username, password)}
+        self.credentials = credentials
+        self.scrapers = {}
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    @classmethod
+    def from_env(cls):
+        credentials = {}
+        for provider, prefix in (("ixl", "IXL"), ("math_academy", "MATHACADEMY")):
+            username = os.environ.get(f"{prefix}_USERNAME")
+            password = os.environ.get(f"{prefix}_PASSWORD")
+            if username and password:
+                credentials[(provider, username)] = (username, password)
+        if not credentials:
+            raise ValueError("No IXL or Math Academy credentials set in environment variables")
+        return cls(credentials)
+
+    @property
+    def accounts(self):
+        return list(self.credentials)
+
+    def _scraper(self, provider, tenant):
+        key = (provider, tenant)
+        if key not in self.scrapers:
+            import get_stats
+
+            scraper_class = {
+                "ixl": get_stats.IXLStatsScraper,
+                "math_academy": get_stats.MathAcademyStatsScraper,
+            }[provider]
+            scraper = scraper_class(get_stats.setup_driver())
+            self.scrapers[key] = scraper
+            scraper.credentials = self.credentials[key]
+            scraper.restore_session()
+        return self.scrapers[key]
+
+    def discover(self, provider, tenant):
+        if provider != "ixl":
+            raise ValueError(f"{provider} students must be enqueued explicitly")
+        return self._scraper(provider, tenant).get_student_names()
+
+    def run(self, provider, tenant, student):
+        scraper = self._scraper(provider, tenant)
+        if provider == "ixl":
+            # A job has no deadline of its own, so nothing is skipped for time.
+            scraper.planner = planner.RunPlanner()
+            scraper.scrape_students([student])
+            # The scraper logs and swallows errors; fail the job so it is retried.
+            data = scraper.student_data.get(student)
+            if data is None:
+                raise RuntimeError(f"Could not read IXL student {student}")
+            if scraper.needs_progress(data) and "progress_table" not in data:
+                raise RuntimeError(f"Could not extract IXL progress for {student}")
+        else:
+            # Data is stored under the name shown on the page rather than the ID.
+            scraper.process_student_data(student)
+
+        result = dict(scraper.student_data)
+        scraper.student_data.clear()
+        if not result:
+            raise RuntimeError(f"No data extracted for {provider} student {student}")
+        return result
+
+    def reset(self, provider, tenant):
+        """Quit one account's driver; the next job for it logs in with a fresh one."""
+        scraper = self.scrapers.pop((provider, tenant), None)
+        if scraper:
+            self._quit(scraper)
+
+    def close(self):
+        for scraper in self.scrapers.values():
+            self._quit(scraper)
+        self.scrapers = {}
+
+    def _quit(self, scraper):
+        try:
+            scraper.driver.quit()
+        except Exception as e:
+            self.logger.warning(f"Error quitting driver: {e!s}")
+
+
+def aggregate_run(queue, run_id):
+    """Collect a run's results into ``(ixl_data, math_academy_data)`` for the report.
+
+    Students whose job failed or has not finished are included as skipped, with
+    the reason shown in the report.
+    """
+    logger = logging.getLogger(__name__)
+    data = {"ixl": {}, "math_academy": {}}
+    for job in queue.jobs(run_id):
+        if job.status == DONE:
+            if job.student != DISCOVER:
+                data[job.provider].update(job.result)
+            continue
+
+        if job.status == FAILED:
+            reason = f"the job failed after {job.attempts} attempts ({job.error})"
+        else:
+            reason = "the job had not finished when the report was built"
+        if job.student == DISCOVER:
+            logger.warning(f"{job.provider} students of {job.tenant} were never listed: {reason}")
+        elif job.provider == "ixl":
+            data["ixl"][job.student] = {
+                "stats": "",
+                "skipped": ["stats", "progress_table"],
+                "skipped_reason": reason,
+            }
+        else:
+            data["math_academy"][job.student] = {
+                "student_id": job.student,
+                "skipped": ["summary", "activity"],
+                "skipped_reason": reason,
+            }
+    return data["ixl"], data["math_academy"]
@@ -0,0 +1,177 @@
+"""Memory telemetry and disk spilling for long scraping runs.
+
+RSS is read from ``/proc`` so no extra dependency is needed; on platforms
+without it the readings are ``None`` and no ceiling is ever hit.
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import weakref
+from collections.abc import MutableMapping
+
+_PROC = "/proc"
+
+# Recycling the driver frees browser memory but rarely shrinks Python's own RSS,
+# so wait this many students between recycles instead of recycling after each one.
+RECYCLE_MIN_STUDENTS = 10
+
+
+def _read_stat(pid):
+    """Return ``(ppid, rss_bytes)`` for a process, or None if it cannot be read."""
+    try:
+        with open(os.path.join(_PROC, str(pid), "stat")) as f:
+            stat = f.read()
+    except OSError:
+        return None
+    # The command name may contain spaces and parentheses, so split after the last ")".
+    fields = stat.rpartition(")")[2].split()
+    return int(fields[1]), int(fields[21]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def process_rss(pid):
+    stat = _read_stat(pid)
+    return stat[1] if stat else None
+
+
+def process_tree_rss(pid):
+    """Return the summed RSS of a process and all of its descendants, in bytes."""
+    if process_rss(pid) is None:
+        return None
+
+    children = {}
+    rss = {}
+    for name in os.listdir(_PROC):
+        if not name.isdigit():
+            continue
+        stat = _read_stat(name)
+        if stat:
+            children.setdefault(stat[0], []).append(int(name))
+            rss[int(name)] = stat[1]
+
+    total = 0
+    stack = [pid]
+    while stack:
+        current = stack.pop()
+        total += rss.get(current, 0)
+        stack.extend(children.get(current, []))
+    return total
+
+
+def _mb(value):
+    return None if value is None else value / (1024 * 1024)
+
+
+def _format_mb(value):
+    return "n/a" if value is None else f"{value:.0f} MB"
+
+
+class MemoryMonitor:
+    """Logs Python and browser RSS and reports when their sum passes a ceiling."""
+
+    def __init__(self, ceiling_mb=None, recycle_min_students=RECYCLE_MIN_STUDENTS):
+        self.ceiling_mb = ceiling_mb
+        self.recycle_min_students = recycle_min_students
+        self.peak_python_mb = 0.0
+        self.peak_browser_mb = 0.0
+        self.logger = logging.getLogger(self.__class__.__name__)
+        # None until the first recycle, which is allowed straight away.
+        self._samples_since_recycle = None
+
+    def sample(self, label, browser_pid=None):
+        python_mb = _mb(process_rss(os.getpid()))
+        browser_mb = _mb(process_tree_rss(browser_pid)) if browser_pid else None
+        self.peak_python_mb = max(self.peak_python_mb, python_mb or 0.0)
+        self.peak_browser_mb = max(self.peak_browser_mb, browser_mb or 0.0)
+        if self._samples_since_recycle is not None:
+            self._samples_since_recycle += 1
+        self.logger.info(
+            f"Memory after {label}: python {_format_mb(python_mb)}, browser {_format_mb(browser_mb)}"
+        )
+        return python_mb, browser_mb
+
+    def over_ceiling(self, python_mb, browser_mb):
+        if self.ceiling_mb is None or python_mb is None:
+            return False
+        return python_mb + (browser_mb or 0.0) > self.ceiling_mb
+
+    def recycle_due(self):
+        return (
+            self._samples_since_recycle is None
+            or self._samples_since_recycle >= self.recycle_min_students
+        )
+
+    def record_recycle(self):
+        self._samples_since_recycle = 0
+
+    def log_peak(self):
+        self.logger.info(
+            f"Peak memory: python {_format_mb(self.peak_python_mb)}, "
+            f"browser {_format_mb(self.peak_browser_mb)}"
+        )
+
+
+class _Spilled:
+    __slots__ = ("path",)
+
+    def __init__(self, path):
+        self.path = path
+
+
+class SpillableDict(MutableMapping):
+    """A dict whose values can be moved to JSON files on disk and loaded back on access.
+
+    Keys and insertion order stay in memory. Values that are read after a spill are
+    freshly loaded copies, so only spill entries that are no longer being mutated.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self._items = {}
+        self._spill_dir = None
+        self._spill_count = 0
+        self.update(*args, **kwargs)
+
+    def __getitem__(self, key):
+        value = self._items[key]
+        if isinstance(value, _Spilled):
+            with open(value.path, encoding="utf-8") as f:
+                return json.load(f)
+        return value
+
+    def __setitem__(self, key, value):
+        self._discard_file(key)
+        self._items[key] = value
+
+    def __delitem__(self, key):
+        self._discard_file(key)
+        del self._items[key]
+
+    def __iter__(self):
+        return iter(self._items)
+
+    def __len__(self):
+        return len(self._items)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({list(self._items)!r})"
+
+    def spill(self):
+        """Write every in-memory value to disk and drop it from memory."""
+        for key, value in self._items.items():
+            if isinstance(value, _Spilled):
+                continue
+            if self._spill_dir is None:
+                self._spill_dir = tempfile.mkdtemp(prefix="ixl-spill-")
+                weakref.finalize(self, shutil.rmtree, self._spill_dir, ignore_errors=True)
+            self._spill_count += 1
+            path = os.path.join(self._spill_dir, f"{self._spill_count}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            self._items[key] = _Spilled(path)
+
+    def _discard_file(self, key):
+        value = self._items.get(key)
+        if isinstance(value, _Spilled):
+            os.remove(value.path)
@@ -0,0 +1,79 @@
+"""Render report sections while the browser is still scraping.
+
+Scrapers hand each student's raw fragments to ``RenderPipeline.put`` as soon
+as that student is extracted. Worker threads take them off a bounded queue and
+parse/render them, so page loads and HTML parsing overlap. ``put`` blocks when
+the queue is full, which keeps a fast scraper from piling up raw HTML in memory.
+"""
+
+import logging
+import queue
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import report
+
+EXECUTORS = ("thread", "process")
+
+_STOP = object()
+
+
+class RenderPipeline:
+    def __init__(self, workers=2, max_pending=8, executor="thread"):
+        if executor not in EXECUTORS:
+            raise ValueError(f"executor must be one of: {', '.join(EXECUTORS)}")
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._rendered = {}
+        self._closed = False
+        # bs4 parsing holds the GIL, so CPU-bound renders scale only across processes.
+        self._pool = ProcessPoolExecutor(workers) if executor == "process" else None
+        self._threads = [
+            threading.Thread(target=self._consume, name=f"render-{i}", daemon=True)
+            for i in range(workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def put(self, provider, student_name, data):
+        """Queue one student's raw data for rendering, blocking while the queue is full."""
+        self._queue.put((provider, student_name, data))
+
+    def _consume(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                provider, student_name, data = item
+                try:
+                    if self._pool is not None:
+                        html = self._pool.submit(
+                            report.render_section, provider, student_name, data
+                        ).result()
+                    else:
+                        html = report.render_section(provider, student_name, data)
+                except Exception as e:
+                    # build_report_html renders anything missing, so this only costs time.
+                    self.logger.error(
+                        f"Failed to render {provider} section for {student_name}: {e!s}"
+                    )
+                    continue
+                with self._lock:
+                    self._rendered[(provider, student_name)] = html
+            finally:
+                self._queue.task_done()
+
+    def close(self):
+        """Wait for queued work and return ``{(provider, student_name): html}``."""
+        if self._closed:
+            return dict(self._rendered)
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        if self._pool is not None:
+            self._pool.shutdown()
+        return dict(self._rendered)
@@ -0,0 +1,227 @@
+"""Deadline-aware scheduling of per-student scraping work.
+
+Each student is scraped in two phases: a cheap ``summary`` check (IXL stats
+line, Math Academy XP) and, for IXL, an expensive ``detail`` extraction of the
+progress table. With a deadline the planner orders students so those likely
+to have activity come first, only starts work that its cost estimate says will
+finish before the deadline, and lets details wait until every pending summary
+is affordable. Without one, students are visited in their original order.
+
+Costs and activity are smoothed across runs and kept in a small JSON file.
+
+``ixl_steps`` holds the IXL visiting order in one place for both scraper
+backends, which only carry out the steps it yields.
+"""
+
+import json
+import logging
+import math
+import os
+import time
+from contextlib import contextmanager
+
+SUMMARY = "summary"
+DETAIL = "detail"
+# Further steps yielded by ixl_steps.
+SELECT = "select"
+SKIP = "skip"
+FINISH = "finish"
+
+DEFAULT_COSTS = {SUMMARY: 5.0, DETAIL: 15.0}
+# Unknown students rank between ones that are usually active and ones that never are.
+DEFAULT_ACTIVITY = 0.5
+# Weight of the newest observation in the running estimates.
+SMOOTHING = 0.5
+
+
+class RunPlanner:
+    def __init__(self, budget_seconds=None, history_path=None, reserve_seconds=30, clock=None):
+        self.clock = clock or time.monotonic
+        # Keep some of the budget back for rendering and sending the report.
+        self.deadline = (
+            None if budget_seconds is None else self.clock() + budget_seconds - reserve_seconds
+        )
+        self.history_path = history_path
+        self.history = self._load_history()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._pending_summaries = []
+        self._finished_summaries = set()
+
+    def _load_history(self):
+        if not self.history_path or not os.path.exists(self.history_path):
+            return {}
+        try:
+            with open(self.history_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.getLogger(self.__class__.__name__).warning(
+                f"Ignoring unreadable planner history {self.history_path}: {e!s}"
+            )
+            return {}
+
+    def save(self):
+        if not self.history_path:
+            return
+        tmp_path = f"{self.history_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.history, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.history_path)
+
+    @property
+    def has_deadline(self):
+        return self.deadline is not None
+
+    def remaining(self):
+        return math.inf if self.deadline is None else self.deadline - self.clock()
+
+    def _student(self, provider, student):
+        return self.history.get(provider, {}).get(student, {})
+
+    def estimate(self, provider, student, phase):
+        return self._student(provider, student).get(phase, DEFAULT_COSTS[phase])
+
+    def activity(self, provider, student):
+        return self._student(provider, student).get("activity", DEFAULT_ACTIVITY)
+
+    def plan(self, provider, students):
+        """Register the summaries still to do and return ``students`` in the order to visit.
+
+        With a deadline, likely-active students come first, then cheaper ones;
+        without one the order is kept so the report reads the same every day.
+        Calling this again for the same students only reorders them.
+        """
+        for student in students:
+            key = (provider, student)
+            if key not in self._finished_summaries and key not in self._pending_summaries:
+                self._pending_summaries.append(key)
+        if not self.has_deadline:
+            return list(students)
+        return sorted(
+            students,
+            key=lambda s: (-self.activity(provider, s), self.estimate(provider, s, SUMMARY)),
+        )
+
+    def can_afford(self, provider, student, phase):
+        if not self.has_deadline:
+            return True
+
+        needed = self.estimate(provider, student, phase)
+        if phase == DETAIL:
+            # Details only run once every outstanding summary still fits.
+            needed += sum(
+                self.estimate(p, s, SUMMARY)
+                for p, s in self._pending_summaries
+                if (p, s) != (provider, student)
+            )
+        remaining = self.remaining()
+        if remaining < needed:
+            self.logger.warning(
+                f"Skipping {phase} for {provider} student {student}: "
+                f"~{needed:.0f}s needed, {max(remaining, 0):.0f}s left before the deadline"
+            )
+            return False
+        return True
+
+    def start_summary(self, provider, student):
+        """Return whether to start a summary. One that does not fit is given up for good."""
+        if self.can_afford(provider, student, SUMMARY):
+            return True
+        self.finish_summary(provider, student)
+        return False
+
+    @contextmanager
+    def timed(self, provider, student, phase):
+        """Time one phase of work and fold it into the student's cost estimate."""
+        start = self.clock()
+        try:
+            yield
+        finally:
+            self._update(provider, student, phase, self.clock() - start)
+            if phase == SUMMARY:
+                self.finish_summary(provider, student)
+
+    def finish_summary(self, provider, student):
+        key = (provider, student)
+        if key in self._pending_summaries:
+            self._pending_summaries.remove(key)
+        self._finished_summaries.add(key)
+
+    def record_activity(self, provider, student, active):
+        self._update(provider, student, "activity", 1.0 if active else 0.0)
+
+    def _update(self, provider, student, field, value):
+        entry = self.history.setdefault(provider, {}).setdefault(student, {})
+        previous = entry.get(field)
+        entry[field] = value if previous is None else (1 - SMOOTHING) * previous + SMOOTHING * value
+
+
+def for_scrape(run_planner, math_academy_students):
+    """Return the planner for a scrape of both sites, creating one without a deadline if needed."""
+    run_planner = run_planner or RunPlanner()
+    # Register Math Academy summaries up front so IXL details leave time for them.
+    run_planner.plan("math_academy", math_academy_students)
+    return run_planner
+
+
+class Steps:
+    """Iterate over a generator such as ``ixl_steps``, sending back ``outcome``.
+
+    Set ``outcome`` to the result of each step before asking for the next. The
+    iteration itself never blocks, so the same loop works in async code.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.outcome = None
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        outcome, self.outcome = self.outcome, None
+        return self.steps.send(outcome)
+
+
+def ixl_steps(run_planner, students):
+    """Yield the IXL work for ``students`` as ``(step, student, sections)`` tuples.
+
+    The caller carries out each step and sends back its outcome, usually through
+    ``Steps``:
+
+    - ``SELECT``: select the student; send whether that worked
+    - ``SUMMARY``: read the summary line; send whether there is progress to fetch
+    - ``DETAIL``: collect the progress details
+    - ``SKIP``: record ``sections`` as skipped
+    - ``FINISH``: the student's data is complete
+
+    Summary and detail steps are timed while the caller performs them. With a
+    deadline, every summary comes before any details.
+    """
+    deferred = []
+    for student in run_planner.plan("ixl", students):
+        if not run_planner.start_summary("ixl", student):
+            yield SKIP, student, ["stats", "progress_table"]
+            yield FINISH, student, None
+            continue
+
+        with run_planner.timed("ixl", student, SUMMARY):
+            selected = yield SELECT, student, None
+            needs_detail = selected and (yield SUMMARY, student, None)
+        if not selected:
+            continue
+
+        if needs_detail and run_planner.has_deadline:
+            deferred.append(student)
+            continue
+        if needs_detail:
+            with run_planner.timed("ixl", student, DETAIL):
+                yield DETAIL, student, None
+        yield FINISH, student, None
+
+    for student in deferred:
+        if run_planner.can_afford("ixl", student, DETAIL) and (yield SELECT, student, None):
+            with run_planner.timed("ixl", student, DETAIL):
+                yield DETAIL, student, None
+        else:
+            yield SKIP, student, ["progress_table"]
+        yield FINISH, student, None
@@ -0,0 +1,210 @@
+"""HTML report rendering for scraped IXL and Math Academy data.
+
+BeautifulSoup is imported inside the functions that need it so that importing
+this module (e.g. from the CLI or the tests) stays cheap.
+"""
+
+
+def process_table_html(table_html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(table_html, "html.parser")
+
+    # Create a new table
+    new_table = soup.new_tag("table")
+    new_table["style"] = "border-collapse: collapse; width: 100%;"
+
+    # Add header row
+    header = soup.new_tag("tr")
+    headers = [
+        "Subject/Category/Skill",
+        "Code",
+        "Time Spent",
+        "#",
+        "Score Improvement",
+    ]
+    for h in headers:
+        th = soup.new_tag("th")
+        th.string = h
+        th["style"] = "border: 1px solid #ddd; padding: 8px; background-color: #f2f2f2;"
+        header.append(th)
+    new_table.append(header)
+
+    # Process rows
+    for row in soup.select('div[class*="row"]'):
+        new_row = soup.new_tag("tr")
+
+        row_classes = row.get("class")
+        if isinstance(row_classes, list) and "subject-grade-row" in row_classes:
+            td = soup.new_tag("td")
+            td.string = row.get_text().strip()
+            td["colspan"] = "5"
+            td["style"] = (
+                "border: 1px solid #ddd; padding: 8px; font-weight: bold; background-color: #e6e6e6;"
+            )
+            new_row.append(td)
+        elif isinstance(row_classes, list) and "category-row" in row_classes:
+            td = soup.new_tag("td")
+            td.string = row.get_text().strip()
+            td["colspan"] = "5"
+            td["style"] = (
+                "border: 1px solid #ddd; padding: 8px; font-style: italic; background-color: #f9f9f9;"
+            )
+            new_row.append(td)
+        elif isinstance(row_classes, list) and "skill-row" in row_classes:
+            score_cells = row.select(".skill-improvement .score")
+            plain_cells = [
+                row.select_one(".skill-name-and-permacode span"),
+                row.select_one(".permacode"),
+                row.select_one(".skill-time"),
+                row.select_one(".skill-questions"),
+            ]
+
+            for cell in plain_cells:
+                td = soup.new_tag("td")
+                td["style"] = "border: 1px solid #ddd; padding: 8px;"
+                td.string = cell.get_text().strip() if cell else "N/A"
+                new_row.append(td)
+
+            score_td = soup.new_tag("td")
+            score_td["style"] = "border: 1px solid #ddd; padding: 8px;"
+            score_td.string = (
+                f"{score_cells[0].get_text()} to {score_cells[1].get_text()}"
+                if len(score_cells) == 2
+                else "N/A"
+            )
+            new_row.append(score_td)
+
+        new_table.append(new_row)
+
+    return str(new_table)
+
+
+def parse_activity_html(activity_html):
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(activity_html, "html.parser")
+    parsed_data = []
+    date_count = 0
+
+    for tr in soup.find_all("tr"):
+        if not tr.get("class"):
+            date_td = tr.find("td", class_="dateHeader")
+            if date_td:
+                date_count += 1
+                if date_count >= 3:
+                    break  # Stop parsing after the second date row
+                xp_span = date_td.find("span", class_="dateTotalXP")
+                xp = xp_span.get_text(strip=True) if xp_span else ""
+
+                # Remove the XP span from the date_td to get the date
+                if xp_span:
+                    xp_span.extract()
+                date = date_td.get_text(strip=True)
+                parsed_data.append({"type": "date", "date": date, "xp": xp})
+        elif date_count < 3:  # Only parse task rows before the third date row
+            task_type_td = tr.find("td", class_="taskTypeColumn")
+            task_name_div = tr.find("div", class_="taskName")
+            completion_td = tr.find("td", class_="taskCompletedColumn")
+            points_span = tr.find("span", class_="taskPoints") or tr.find(
+                "span", class_="completedTaskPoints"
+            )
+
+            parsed_data.append(
+                {
+                    "type": "task",
+                    "task_type": (task_type_td.get_text(strip=True) if task_type_td else ""),
+                    "task_name": (task_name_div.get_text(strip=True) if task_name_div else ""),
+                    "completion": (completion_td.get_text(strip=True) if completion_td else ""),
+                    "points": (points_span.get_text(strip=True) if points_span else ""),
+                }
+            )
+
+    return parsed_data
+
+
+def format_activity_html(parsed_data):
+    html = "<table border='1' style='border-collapse: collapse; width: 100%;'>"
+    html += "<tr style='background-color: #f2f2f2;'><th>Type</th><th>Name</th><th>Completion</th><th>Points</th></tr>"
+
+    for item in parsed_data:
+        if item["type"] == "date":
+            html += "<tr style='background-color: #e6e6e6;'>"
+            html += f"<td colspan='4'><strong>{item['date']} - {item['xp']}</strong></td></tr>"
+        else:
+            html += f"<tr><td>{item['task_type']}</td><td>{item['task_name']}</td><td>{item['completion']}</td><td>{item['points']}</td></tr>"
+
+    html += "</table>"
+    return html
+
+
+SKIPPED_NOTE = "<p><em>{} skipped: {}.</em></p>"
+DEFAULT_SKIPPED_REASON = "the run reached its deadline"
+
+
+def _skipped_note(section, data):
+    return SKIPPED_NOTE.format(section, data.get("skipped_reason", DEFAULT_SKIPPED_REASON))
+
+
+def render_ixl_section(student_name, data):
+    skipped = data.get("skipped", [])
+    if "stats" in skipped:
+        return f"<h3>{student_name}</h3>" + _skipped_note("Stats and progress", data)
+
+    html = f"<h3>{student_name} {data['stats']}</h3>"
+    if "progress_table" in data:
+        html += process_table_html(data["progress_table"])
+    elif "progress_table" in skipped:
+        html += _skipped_note("Progress details", data)
+    return html
+
+
+def render_math_academy_section(student_name, data):
+    if "summary" in data.get("skipped", []):
+        return f"<h3>Student ID {data['student_id']}</h3>" + _skipped_note("XP and activity", data)
+
+    html = f"<h3>{student_name}: today {data['daily_xp_earned']}/{data['daily_xp_goal']} XP, this week {data['weekly_xp']} XP</h3>"
+    parsed_activity = parse_activity_html(data["activity_html"])
+    html += format_activity_html(parsed_activity)
+    return html
+
+
+SECTION_RENDERERS = {
+    "ixl": render_ixl_section,
+    "math_academy": render_math_academy_section,
+}
+
+
+def render_section(provider, student_name, data):
+    return SECTION_RENDERERS[provider](student_name, data)
+
+
+def build_report_html(ixl_data, math_academy_data, rendered=None):
+    """Render the combined report, or return None when there is nothing to report.
+
+    ``rendered`` maps ``(provider, student_name)`` to sections already rendered
+    elsewhere (see ``pipeline.RenderPipeline``); anything missing is rendered here.
+    """
+    if not ixl_data and not math_academy_data:
+        return None
+    rendered = rendered or {}
+
+    def section(provider, student_name, data):
+        html = rendered.get((provider, student_name))
+        return html if html is not None else render_section(provider, student_name, data)
+
+    html_content = "<html><body>"
+    if ixl_data:
+        # IXL Report
+        html_content += "<h2>IXL</h2>"
+        for student_name, data in ixl_data.items():
+            html_content += section("ixl", student_name, data)
+
+    if math_academy_data:
+        # Math Academy Report
+        html_content += "<h2>Math Academy</h2>"
+        for student_name, data in math_academy_data.items():
+            html_content += section("math_academy", student_name, data)
+
+    html_content += "</body></html>"
+    return html_content
@@ -0,0 +1,170 @@
+"""What the IXL and Math Academy pages look like and how a student's data is read.
+
+Both scraper backends, Selenium in ``get_stats`` and CDP in ``cdp_scrapers``,
+inherit these classes and only supply the browser I/O. URLs, locators, the
+parsing of page text and the bookkeeping for each student live here once.
+"""
+
+import functools
+import logging
+from collections.abc import MutableMapping
+
+from planner import RunPlanner
+
+# Locator strategies. The values match selenium's ``By`` constants so the same
+# (by, value) pairs work with both scraper backends.
+ID = "id"
+CSS_SELECTOR = "css selector"
+XPATH = "xpath"
+
+# The IXL summary line of a student who did nothing in the selected date range.
+IXL_NO_ACTIVITY = "answered 0 questions spent 0 min practicing made progress in 0 skills"
+
+
+class Site:
+    provider: str
+    # Provided by the scraper classes that inherit this.
+    logger: logging.Logger
+    student_data: MutableMapping
+    planner: RunPlanner
+
+    def attach(self, run_planner, memory_monitor, on_student=None):
+        """Share one run's planner and memory monitor between the scrapers of a scrape.
+
+        ``run_planner`` orders students and skips work that would not finish before
+        its deadline. ``on_student(provider, student_name, data)`` is called as each
+        student is extracted.
+        """
+        self.planner = run_planner
+        self.memory_monitor = memory_monitor
+        if on_student:
+            self.on_student = functools.partial(on_student, self.provider)
+
+
+class IXLSite(Site):
+    provider = "ixl"
+    login_url = "https://www.ixl.com/analytics/student-usage#"
+    progress_url = "https://www.ixl.com/analytics/progress-and-improvement"
+    # Seconds to let the usage page refresh after a student is selected.
+    settle_delay = 3
+
+    USERNAME = (ID, "qlusername")
+    PASSWORD = (ID, "qlpassword")
+    SUBMIT = (ID, "qlsubmit")
+    SUBACCOUNTS = (CSS_SELECTOR, "label[data-cy^='subaccount-selection-']")
+    PARENT_SUBACCOUNT = (
+        XPATH,
+        "//label[contains(@data-cy, 'subaccount-selection-') and .//span[text()='Parent']]",
+    )
+    DATE_RANGE = (CSS_SELECTOR, ".date-range")
+    DATE_RANGE_OPEN = (CSS_SELECTOR, ".date-range .option-select.global .select-open")
+    DATE_RANGE_BODY = (CSS_SELECTOR, ".date-range .select-body")
+    DATE_RANGE_SELECTION = (CSS_SELECTOR, ".date-range .option-selection")
+    STUDENT_SELECT_OPEN = (CSS_SELECTOR, ".student-select .option-select.global .select-open")
+    STUDENT_SELECT_BODY = (CSS_SELECTOR, ".student-select .select-body")
+    STUDENT_OPTIONS = ".option-select.global.default.active .select-dropdown .option"
+    STUDENT_NAME_ATTRIBUTE = "data-name"
+    STUDENT_SELECTION = (CSS_SELECTOR, ".student-select .option-selection")
+    SUMMARY_STATS = (CSS_SELECTOR, ".summary-stat-container")
+    PROGRESS_TABLE = (CSS_SELECTOR, ".student-improvement-table")
+    SKILL_ROWS = ".student-improvement-table .skill-row"
+    # Text fields of a progress table row, relative to the row.
+    SKILL_FIELDS = (
+        ("name", ".skill-name-and-permacode span"),
+        ("code", ".permacode"),
+        ("time", ".skill-time"),
+        ("questions", ".skill-questions"),
+    )
+    SKILL_SCORES = ".skill-improvement .score"
+
+    @staticmethod
+    def date_range_option(option):
+        return (XPATH, f"//div[@class='option' and contains(text(), '{option}')]")
+
+    @staticmethod
+    def needs_progress(data):
+        """Whether a student's summary shows activity, so a progress table is expected."""
+        return IXL_NO_ACTIVITY not in data["stats"]
+
+    def record_summary(self, student_name, stats_text):
+        """Store a student's summary line and return whether there is progress to fetch."""
+        stats = " ".join(stats_text.split()).lower()
+        self.logger.info(f"IXL Stats for {student_name}: {stats}")
+        self.student_data[student_name] = {"stats": stats}
+
+        active = self.needs_progress(self.student_data[student_name])
+        self.planner.record_activity(self.provider, student_name, active)
+        if not active:
+            self.logger.info(f"No progress to report for {student_name}")
+        return active
+
+    def record_progress(self, student_name, table_html, rows):
+        """Store a student's progress table and log its rows.
+
+        ``rows`` are dicts with the ``SKILL_FIELDS`` keys and a list of ``scores``.
+        """
+        # Write the entry back: it may have been spilled and loaded as a copy.
+        data = self.student_data[student_name]
+        data["progress_table"] = table_html
+        self.student_data[student_name] = data
+
+        for row in rows:
+            scores = row["scores"]
+            score_from = scores[0] if scores else "N/A"
+            score_to = scores[1] if len(scores) > 1 else "N/A"
+
+            log_message = f"{student_name} - Skill: {row['name']} ({row['code']}), Time: {row['time']}, Questions: {row['questions']}, Improvement: {score_from} to {score_to}"
+            self.logger.info(log_message)
+
+    def skip_sections(self, student_name, sections):
+        data = self.student_data.get(student_name) or {"stats": ""}
+        data["skipped"] = sections
+        self.student_data[student_name] = data
+
+
+class MathAcademySite(Site):
+    provider = "math_academy"
+    login_url = "https://mathacademy.com/login"
+    base_activity_url = "https://mathacademy.com/students/{}/activity"
+
+    USERNAME = (ID, "usernameOrEmail")
+    PASSWORD = (ID, "password")
+    LOGIN_BUTTON = (ID, "loginButton")
+    STUDENT_NAME = (ID, "studentName")
+    DAILY_XP = (ID, "dailyGoalPoints")
+    WEEKLY_XP = (ID, "thisWeekTotalXP")
+    ACTIVITY = (ID, "tasksFrame")
+
+    @staticmethod
+    def skipped_entry(student_id):
+        """Return ``(key, data)`` for a student whose page was never read.
+
+        The name is only known from the page, so skipped students are keyed by ID.
+        """
+        return student_id, {"student_id": student_id, "skipped": ["summary", "activity"]}
+
+    def student_entry(self, student_id, student_name, daily_xp_text, weekly_xp_text, activity_html):
+        """Turn the texts read from an activity page into ``(student_name, data)``."""
+        student_name = student_name.strip()
+
+        # Extract daily and weekly XP
+        daily_xp_text = daily_xp_text.strip()
+        daily_xp_earned, daily_xp_goal = (
+            daily_xp_text.split("/")[0],
+            daily_xp_text.split("/")[1].split()[0],
+        )
+        weekly_xp = weekly_xp_text.split()[0]
+
+        self.planner.record_activity(
+            self.provider, student_id, daily_xp_earned.strip() not in ("", "0")
+        )
+        self.logger.info(
+            f"Processed Math Academy data for student: {student_name} (ID: {student_id})"
+        )
+        return student_name, {
+            "student_id": student_id,
+            "daily_xp_earned": daily_xp_earned,
+            "daily_xp_goal": daily_xp_goal,
+            "weekly_xp": weekly_xp,
+            "activity_html": activity_html,
+        }
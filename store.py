@@ -0,0 +1,65 @@
+"""On-disk store of raw scrape results, one JSON file per run."""
+
+import json
+import os
+from datetime import UTC, datetime
+
+RUN_FILE_PREFIX = "run-"
+RUN_FILE_SUFFIX = ".json"
+
+
+def save_run(store_dir, ixl_data, math_academy_data, created_at=None):
+    created_at = created_at or datetime.now(UTC)
+    os.makedirs(store_dir, exist_ok=True)
+    path = os.path.join(
+        store_dir,
+        f"{RUN_FILE_PREFIX}{created_at.strftime('%Y%m%dT%H%M%S%fZ')}{RUN_FILE_SUFFIX}",
+    )
+    # Write to a temporary file first so readers never see a half-written run.
+    # Students are serialized one at a time so data spilled to disk (see
+    # memory.SpillableDict) is never loaded back all at once.
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(f'{{"created_at": {json.dumps(created_at.isoformat())}')
+        for key, data in (("ixl", ixl_data), ("math_academy", math_academy_data)):
+            f.write(f", {json.dumps(key)}: {{")
+            for i, (student_name, student) in enumerate(data.items()):
+                if i:
+                    f.write(", ")
+                f.write(f"{json.dumps(student_name)}: {json.dumps(student)}")
+            f.write("}")
+        f.write("}")
+    os.replace(tmp_path, path)
+    return path
+
+
+def list_runs(store_dir):
+    """Return the paths of all stored runs, oldest first."""
+    if not os.path.isdir(store_dir):
+        return []
+    return [
+        os.path.join(store_dir, name)
+        for name in sorted(os.listdir(store_dir))
+        if name.startswith(RUN_FILE_PREFIX) and name.endswith(RUN_FILE_SUFFIX)
+    ]
+
+
+def load_run(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_latest(store_dir):
+    runs = list_runs(store_dir)
+    if not runs:
+        return None
+    return load_run(runs[-1])
+
+
+def run_id(path):
+    """Return the identifier of a stored run, e.g. ``20260101T235900000000Z``."""
+    return os.path.basename(path)[len(RUN_FILE_PREFIX) : -len(RUN_FILE_SUFFIX)]
+
+
+def run_path(store_dir, run_id):
+    return os.path.join(store_dir, f"{RUN_FILE_PREFIX}{run_id}{RUN_FILE_SUFFIX}")
@@ -0,0 +1,43 @@
+import pytest
+
+
+class Clock:
+    """A settable stand-in for ``time.monotonic`` or ``time.time``."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return Clock()
+
+
+@pytest.fixture
+def ixl_data():
+    return {
+        "Alice": {"stats": "answered 0 questions spent 0 min practicing made progress in 0 skills"}
+    }
+
+
+@pytest.fixture
+def math_academy_data():
+    return {
+        "Bob": {
+            "student_id": "42",
+            "daily_xp_earned": "30",
+            "daily_xp_goal": "40",
+            "weekly_xp": "120",
+            "activity_html": (
+                "<table><tr><td class='dateHeader'>Mon, Jan 1"
+                "<span class='dateTotalXP'>30 XP</span></td></tr>"
+                "<tr class='task'><td class='taskTypeColumn'>Lesson</td>"
+                "<td><div class='taskName'>Fractions</div></td>"
+                "<td class='taskCompletedColumn'>100%</td>"
+                "<td><span class='taskPoints'>30</span></td></tr></table>"
+            ),
+        }
+    }
@@ -0,0 +1,188 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from datetime import UTC, datetime
+
+import pytest
+
+import api
+import store
+
+
+@pytest.fixture
+def serve(tmp_path, clock):
+    servers = []
+
+    def start(**kwargs):
+        results_api = api.ResultsAPI(tmp_path, ttl=60, clock=clock, **kwargs)
+        server = api.make_server(results_api, port=0)
+        threading.Thread(
+            target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True
+        ).start()
+        servers.append(server)
+        return results_api, f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def _request(url, method="GET", headers=None):
+    request = urllib.request.Request(url, method=method, headers=headers or {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as e:
+        return e.code, e.headers, e.read()
+
+
+@pytest.fixture
+def save_run(tmp_path, ixl_data, math_academy_data):
+    def save(day, math_academy=math_academy_data):
+        return store.save_run(
+            tmp_path, ixl_data, math_academy, created_at=datetime(2026, 1, day, tzinfo=UTC)
+        )
+
+    return save
+
+
+def test_latest_and_history(tmp_path, serve, save_run):
+    save_run(1, {})
+    save_run(2)
+    _, base_url = serve()
+
+    status, _, body = _request(f"{base_url}/latest")
+    latest = json.loads(body)
+    assert status == 200
+    assert latest["run_id"] == "20260102T000000000000Z"
+    assert latest["math_academy"]["Bob"]["weekly_xp"] == "120"
+
+    status, _, body = _request(f"{base_url}/history")
+    history = json.loads(body)
+    assert [run["run_id"] for run in history] == [
+        "20260101T000000000000Z",
+        "20260102T000000000000Z",
+    ]
+    assert history[1]["math_academy"] == {
+        "Bob": {"daily_xp_earned": "30", "daily_xp_goal": "40", "weekly_xp": "120"}
+    }
+    assert "activity_html" not in body.decode()
+
+    status, _, body = _request(f"{base_url}/runs/20260101T000000000000Z")
+    assert status == 200
+    assert json.loads(body)["math_academy"] == {}
+
+
+@pytest.mark.parametrize("path", ["/latest", "/runs/20990101T000000000000Z", "/runs/..", "/nope"])
+def test_missing_resources_are_404(serve, path):
+    _, base_url = serve()
+
+    status, _, _ = _request(f"{base_url}{path}")
+    assert status == 404
+
+
+def test_conditional_get_returns_304_for_matching_etag(tmp_path, serve, save_run):
+    save_run(1)
+    _, base_url = serve()
+
+    _, headers, _ = _request(f"{base_url}/latest")
+    etag = headers["ETag"]
+
+    status, headers, body = _request(f"{base_url}/latest", headers={"If-None-Match": etag})
+    assert status == 304
+    assert headers["ETag"] == etag
+    assert body == b""
+
+    status, _, _ = _request(f"{base_url}/latest", headers={"If-None-Match": '"stale"'})
+    assert status == 200
+
+
+def test_responses_are_cached_until_ttl_expires(tmp_path, serve, clock, save_run):
+    save_run(1)
+    _, base_url = serve()
+    _, first_headers, _ = _request(f"{base_url}/latest")
+
+    save_run(2)
+    _, cached_headers, cached = _request(f"{base_url}/latest")
+    assert cached_headers["ETag"] == first_headers["ETag"]
+    assert json.loads(cached)["run_id"] == "20260101T000000000000Z"
+
+    clock.now += 61
+    _, fresh_headers, fresh = _request(f"{base_url}/latest")
+    assert fresh_headers["ETag"] != first_headers["ETag"]
+    assert json.loads(fresh)["run_id"] == "20260102T000000000000Z"
+
+
+def test_history_loads_each_run_file_once(tmp_path, clock, save_run, monkeypatch):
+    save_run(1)
+    results_api = api.ResultsAPI(tmp_path, ttl=60, clock=clock)
+    loaded = []
+    load_run = store.load_run
+    monkeypatch.setattr(store, "load_run", lambda path: loaded.append(path) or load_run(path))
+
+    results_api.history()
+    save_run(2)
+    history = results_api.history()
+
+    assert [run["run_id"] for run in history] == [
+        "20260101T000000000000Z",
+        "20260102T000000000000Z",
+    ]
+    assert loaded == store.list_runs(tmp_path)
+
+
+def test_refresh_is_rejected_unless_allowed(serve):
+    _, base_url = serve()
+
+    status, _, _ = _request(f"{base_url}/refresh", method="POST")
+    assert status == 405
+
+
+def test_concurrent_refreshes_coalesce_into_one_scrape(tmp_path, serve, save_run):
+    release = threading.Event()
+    scrapes = []
+
+    def fake_scrape():
+        scrapes.append(1)
+        release.wait(5)
+        save_run(2)
+
+    save_run(1)
+    results_api, base_url = serve(allow_refresh=True, refresh=fake_scrape)
+    _request(f"{base_url}/latest")
+
+    responses = [json.loads(_request(f"{base_url}/refresh", method="POST")[2]) for _ in range(3)]
+    assert [response["started"] for response in responses] == [True, False, False]
+    assert json.loads(_request(f"{base_url}/refresh")[2])["refreshing"] is True
+
+    release.set()
+    results_api.refresher.wait(5)
+
+    assert scrapes == [1]
+    # Finishing a refresh clears the cache, so the new run is visible before the TTL.
+    assert json.loads(_request(f"{base_url}/latest")[2])["run_id"] == "20260102T000000000000Z"
+
+
+@pytest.mark.parametrize("saves_run", [True, False])
+def test_scrape_into_store_never_emails_and_fails_without_a_new_run(
+    tmp_path, monkeypatch, saves_run, ixl_data, math_academy_data
+):
+    monkeypatch.setenv("SEND_EMAIL", "true")
+    calls = []
+
+    def fake_run(command, env, check):
+        calls.append(env)
+        if saves_run:
+            store.save_run(env["RESULTS_STORE"], ixl_data, math_academy_data)
+
+    monkeypatch.setattr(api.subprocess, "run", fake_run)
+
+    if saves_run:
+        api.scrape_into_store(str(tmp_path))
+    else:
+        with pytest.raises(RuntimeError, match="without saving a run"):
+            api.scrape_into_store(str(tmp_path))
+    assert calls[0]["SEND_EMAIL"] == "false"
+    assert calls[0]["RESULTS_STORE"] == str(tmp_path)
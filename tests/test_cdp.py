@@ -0,0 +1,16 @@
+import asyncio
+import os
+
+import pytest
+
+import cdp
+
+
+def test_launch_reports_chrome_that_exits_before_devtools(tmp_path):
+    executable = tmp_path / "chrome"
+    # A leftover child holds stderr open, so the failure is only seen after Chrome is reaped.
+    executable.write_text("#!/bin/sh\necho 'cannot open display' >&2\n(sleep 0.5) &\nexit 1\n")
+    os.chmod(executable, 0o755)
+
+    with pytest.raises(cdp.CDPError, match="exited before opening the DevTools endpoint"):
+        asyncio.run(cdp.Browser.launch(executable=str(executable), timeout=10))
@@ -0,0 +1,74 @@
+import pytest
+
+import cli
+import store
+
+
+def test_render_from_store_uses_latest_run(tmp_path, capsys, ixl_data, math_academy_data):
+    store.save_run(tmp_path, {}, {"Old": math_academy_data["Bob"]})
+    store.save_run(tmp_path, ixl_data, math_academy_data)
+
+    assert cli.main(["render-from-store", str(tmp_path)]) == 0
+
+    html = capsys.readouterr().out
+    assert "<h3>Alice answered 0 questions" in html
+    assert "Bob: today 30/40 XP, this week 120 XP" in html
+    assert "<td>Lesson</td><td>Fractions</td><td>100%</td><td>30</td>" in html
+    assert "Old" not in html
+
+
+def test_render_from_store_fails_on_empty_store(tmp_path):
+    assert cli.main(["render-from-store", str(tmp_path)]) == 1
+
+
+def test_unknown_subcommand_is_rejected():
+    with pytest.raises(SystemExit):
+        cli.main(["nope"])
+
+
+def test_queue_enqueue_is_idempotent_and_reported_by_status(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("IXL_USERNAME", "parent")
+    monkeypatch.setenv("MATHACADEMY_USERNAME", "parent")
+    monkeypatch.setenv("MATHACADEMY_STUDENT_IDS", "42, 43")
+    args = ["--db", str(tmp_path / "queue.db"), "--run-id", "r1"]
+
+    assert cli.main(["queue", "enqueue", *args]) == 0
+    assert cli.main(["queue", "enqueue", *args]) == 0
+    assert cli.main(["queue", "status", *args]) == 0
+    assert cli.main(["queue", "aggregate", *args]) == 1
+
+    out = capsys.readouterr().out
+    assert "Enqueued 3 new jobs for run r1" in out
+    assert "Enqueued 0 new jobs for run r1" in out
+    assert "pending: 3" in out
+
+
+def test_queue_actions_default_to_last_enqueued_run(tmp_path, monkeypatch, capsys):
+    monkeypatch.setenv("IXL_USERNAME", "parent")
+    monkeypatch.setenv("MATHACADEMY_USERNAME", "parent")
+    monkeypatch.setenv("MATHACADEMY_STUDENT_IDS", "42")
+    db = str(tmp_path / "queue.db")
+
+    assert cli.main(["queue", "status", "--db", db]) == 1
+    assert cli.main(["queue", "enqueue", "--db", db, "--run-id", "2026-01-01"]) == 0
+    capsys.readouterr()
+
+    assert cli.main(["queue", "status", "--db", db]) == 0
+    assert "pending: 2" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("missing", ["GMAIL_USER", "GMAIL_APP_PASSWORD", "RECIPIENT_EMAILS"])
+def test_queue_aggregate_checks_email_settings_when_sending(tmp_path, monkeypatch, capsys, missing):
+    monkeypatch.setenv("IXL_USERNAME", "parent")
+    monkeypatch.setenv("MATHACADEMY_USERNAME", "parent")
+    monkeypatch.setenv("MATHACADEMY_STUDENT_IDS", "42")
+    monkeypatch.setenv("SEND_EMAIL", "true")
+    monkeypatch.setenv("GMAIL_USER", "sender@example.com")
+    monkeypatch.setenv("GMAIL_APP_PASSWORD", "gmail-password")
+    monkeypatch.setenv("RECIPIENT_EMAILS", "parent@example.com")
+    monkeypatch.delenv(missing)
+    args = ["--db", str(tmp_path / "queue.db"), "--run-id", "r1"]
+    assert cli.main(["queue", "enqueue", *args]) == 0
+
+    assert cli.main(["queue", "aggregate", "--partial", *args]) == 1
+    assert f"{missing} not set in environment variables" in capsys.readouterr().err
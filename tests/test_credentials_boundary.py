@@ -59,3 +59,13 @@ def test_blank_only_recipient_email_list_fails_before_browser_launch(monkeypatch
 
     with pytest.raises(ValueError, match="RECIPIENT_EMAILS must contain at least one address"):
         get_stats.main()
+
+
+def test_memory_ceiling_with_cdp_backend_fails_before_browser_launch(monkeypatch):
+    _set_required_env(monkeypatch)
+    monkeypatch.setenv("SCRAPER_BACKEND", "cdp")
+    monkeypatch.setenv("MEMORY_CEILING_MB", "1500")
+    _fail_if_browser_launches(monkeypatch)
+
+    with pytest.raises(ValueError, match="MEMORY_CEILING_MB is only supported"):
+        get_stats.main()
@@ -0,0 +1,48 @@
+"""Guard the CLI startup budget using ``python -X importtime``."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cumulative import time for the CLI entry point, in microseconds.
+STARTUP_BUDGET_US = 150_000
+
+HEAVY_MODULES = ("selenium", "bs4", "pandas", "requests", "wsproto")
+
+
+def _import_times(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # Lines look like: "import time:   self [us] |  cumulative | imported package"
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+@pytest.mark.parametrize(
+    "module", ["api", "cli", "ixl_skills_parse", "jobqueue", "report", "sites", "store"]
+)
+def test_lightweight_modules_do_not_import_heavy_dependencies(module):
+    imported = _import_times(module)
+
+    heavy = sorted(name for name in imported if name.split(".")[0] in HEAVY_MODULES)
+    assert heavy == []
+
+
+def test_cli_import_stays_within_startup_budget():
+    imported = _import_times("cli")
+
+    assert imported["cli"] < STARTUP_BUDGET_US
@@ -0,0 +1,201 @@
+import threading
+
+import pytest
+
+import get_stats
+import jobqueue
+import report
+
+RUN = "2026-01-01"
+
+
+class _FakeRunner:
+    def __init__(self, ixl_data=None, math_academy_data=None, failures=None):
+        self.accounts = [("ixl", "parent"), ("math_academy", "parent")]
+        self.ixl_data = ixl_data
+        self.math_academy_data = math_academy_data
+        # {student: number of times to fail before succeeding}
+        self.failures = dict(failures or {})
+        self.calls = []
+        self.resets = []
+        self.lock = threading.Lock()
+
+    def discover(self, provider, tenant):
+        return list(self.ixl_data)
+
+    def run(self, provider, tenant, student):
+        with self.lock:
+            self.calls.append(student)
+            if self.failures.get(student):
+                self.failures[student] -= 1
+                raise RuntimeError(f"{student} page did not load")
+        if provider == "ixl":
+            return {student: self.ixl_data[student]}
+        return self.math_academy_data
+
+    def reset(self, provider, tenant):
+        self.resets.append((provider, tenant))
+
+    def close(self):
+        pass
+
+
+def _queue(tmp_path, **kwargs):
+    queue = jobqueue.WorkQueue(str(tmp_path / "queue.db"), **kwargs)
+    queue.enqueue(RUN, "ixl", "parent", [jobqueue.DISCOVER])
+    queue.enqueue(RUN, "math_academy", "parent", ["42"])
+    return queue
+
+
+def test_enqueue_is_idempotent(tmp_path):
+    queue = _queue(tmp_path)
+
+    assert queue.enqueue(RUN, "math_academy", "parent", ["42", "43"]) == 1
+    assert queue.status(RUN) == {"pending": 3, "leased": 0, "done": 0, "failed": 0}
+
+
+def test_claim_leases_discovery_first_and_respects_accounts(tmp_path):
+    queue = _queue(tmp_path)
+
+    assert queue.claim(RUN, "w1", 60, accounts=[("ixl", "someone-else")]) is None
+    job = queue.claim(RUN, "w1", 60, accounts=[("ixl", "parent"), ("math_academy", "parent")])
+    assert (job.provider, job.student, job.attempts) == ("ixl", jobqueue.DISCOVER, 1)
+
+    assert queue.claim(RUN, "w2", 60).student == "42"
+    assert queue.claim(RUN, "w3", 60) is None
+    assert not queue.complete(job.id, "w2", [])
+    assert queue.complete(job.id, "w1", [])
+
+
+def test_expired_lease_is_reclaimed_until_attempts_run_out(tmp_path, clock):
+    queue = jobqueue.WorkQueue(str(tmp_path / "queue.db"), max_attempts=2, clock=clock)
+    queue.enqueue(RUN, "math_academy", "parent", ["42"])
+
+    first = queue.claim(RUN, "w1", 60)
+    clock.now += 30
+    assert queue.heartbeat(first.id, "w1", 60)
+    clock.now += 45
+    assert queue.claim(RUN, "w2", 60) is None
+
+    clock.now += 60
+    second = queue.claim(RUN, "w2", 60)
+    assert (second.id, second.attempts) == (first.id, 2)
+    assert not queue.heartbeat(first.id, "w1", 60)
+
+    clock.now += 61
+    assert queue.claim(RUN, "w3", 60) is None
+    assert queue.status(RUN)["failed"] == 1
+    assert not queue.has_unfinished(RUN)
+
+
+def test_worker_discovers_students_and_retries_failures(tmp_path, ixl_data, math_academy_data):
+    queue = _queue(tmp_path)
+    runner = _FakeRunner(ixl_data, math_academy_data, failures={"42": 1})
+
+    assert jobqueue.Worker(queue, runner, "w1", poll_interval=0).run(RUN) == 3
+    assert runner.calls == ["42", "42", "Alice"]
+    assert runner.resets == [("math_academy", "parent")]
+    assert jobqueue.aggregate_run(queue, RUN) == (ixl_data, math_academy_data)
+
+
+def test_concurrent_workers_run_each_job_once(tmp_path):
+    queue = jobqueue.WorkQueue(str(tmp_path / "queue.db"))
+    queue.enqueue(RUN, "ixl", "parent", [f"student-{i}" for i in range(20)])
+
+    class _Runner(_FakeRunner):
+        def run(self, provider, tenant, student):
+            with self.lock:
+                self.calls.append(student)
+            return {student: {"stats": student}}
+
+    runner = _Runner()
+    workers = [
+        threading.Thread(
+            target=jobqueue.Worker(queue, runner, f"w{i}", poll_interval=0).run, args=(RUN,)
+        )
+        for i in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=30)
+
+    assert sorted(runner.calls) == sorted(f"student-{i}" for i in range(20))
+    assert queue.status(RUN)["done"] == 20
+
+
+def test_aggregate_marks_failed_and_unfinished_students_skipped(tmp_path):
+    queue = _queue(tmp_path, max_attempts=1)
+    queue.enqueue(RUN, "ixl", "parent", ["Alice"])
+    discovery = queue.claim(RUN, "w1", 60)
+    queue.complete(discovery.id, "w1", ["Alice"])
+    alice = queue.claim(RUN, "w1", 60, accounts=[("ixl", "parent")])
+    queue.fail(alice.id, "w1", "page did not load")
+
+    ixl_data, math_academy_data = jobqueue.aggregate_run(queue, RUN)
+
+    assert ixl_data["Alice"]["skipped"] == ["stats", "progress_table"]
+    assert "failed after 1 attempts (page did not load)" in ixl_data["Alice"]["skipped_reason"]
+    assert math_academy_data["42"]["skipped"] == ["summary", "activity"]
+    html = report.build_report_html(ixl_data, math_academy_data)
+    assert "had not finished when the report was built" in html
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def quit(self):
+        self.quit_called = True
+
+
+class _FakeIXLScraper(get_stats.IXLStatsScraper):
+    def __init__(self, progress_table=None, selectable=True):
+        super().__init__(_FakeDriver())
+        self.progress_table = progress_table
+        self.selectable = selectable
+
+    def select_student(self, student):
+        return self.selectable
+
+    def process_student_data(self, student):
+        return self.record_summary(student, "Answered 5 questions")
+
+    def get_progress_and_improvement_data(self, student):
+        # Like the real scraper, extraction errors are logged rather than raised.
+        if not self.progress_table:
+            raise RuntimeError("progress table not found")
+        self.record_progress(student, self.progress_table, [])
+
+
+def test_selenium_runner_fails_job_when_progress_is_missing():
+    runner = jobqueue.SeleniumJobRunner({("ixl", "parent"): ("parent", "password")})
+    runner.scrapers[("ixl", "parent")] = _FakeIXLScraper()
+
+    with pytest.raises(RuntimeError, match="progress"):
+        runner.run("ixl", "parent", "Alice")
+
+    runner.scrapers[("ixl", "parent")] = _FakeIXLScraper(selectable=False)
+    with pytest.raises(RuntimeError, match="Could not read"):
+        runner.run("ixl", "parent", "Alice")
+
+    runner.scrapers[("ixl", "parent")] = _FakeIXLScraper(progress_table="<table></table>")
+    assert runner.run("ixl", "parent", "Alice") == {
+        "Alice": {"stats": "answered 5 questions", "progress_table": "<table></table>"}
+    }
+
+
+def test_selenium_runner_reset_only_quits_that_account():
+    runner = jobqueue.SeleniumJobRunner({})
+    ixl_scraper = _FakeIXLScraper()
+    math_academy_scraper = _FakeIXLScraper()
+    runner.scrapers = {
+        ("ixl", "parent"): ixl_scraper,
+        ("math_academy", "parent"): math_academy_scraper,
+    }
+
+    runner.reset("ixl", "parent")
+
+    assert ixl_scraper.driver.quit_called
+    assert not math_academy_scraper.driver.quit_called
+    assert list(runner.scrapers) == [("math_academy", "parent")]
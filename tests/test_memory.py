@@ -0,0 +1,184 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import get_stats
+import memory
+import planner
+import store
+
+has_proc = pytest.mark.skipif(not os.path.isdir("/proc"), reason="requires /proc")
+
+
+def test_spilled_values_load_back_in_order():
+    data = memory.SpillableDict()
+    data["Alice"] = {"stats": "a", "progress_table": "<div>" * 1000}
+    data["Bob"] = {"stats": "b"}
+
+    data.spill()
+    data["Carol"] = {"stats": "c"}
+
+    assert list(data) == ["Alice", "Bob", "Carol"]
+    assert data["Alice"] == {"stats": "a", "progress_table": "<div>" * 1000}
+    assert dict(data.items()) == {
+        "Alice": {"stats": "a", "progress_table": "<div>" * 1000},
+        "Bob": {"stats": "b"},
+        "Carol": {"stats": "c"},
+    }
+
+
+def test_overwriting_spilled_value_removes_its_file():
+    data = memory.SpillableDict(Alice={"stats": "a"})
+    data.spill()
+    spill_dir = data._spill_dir
+
+    data["Alice"] = {"stats": "new"}
+
+    assert os.listdir(spill_dir) == []
+    assert data["Alice"] == {"stats": "new"}
+
+
+def test_save_run_streams_spilled_data(tmp_path):
+    ixl_data = memory.SpillableDict(Alice={"stats": "a"})
+    ixl_data.spill()
+
+    path = store.save_run(tmp_path, ixl_data, {"Bob": {"weekly_xp": "5"}})
+
+    run = store.load_run(path)
+    assert run["ixl"] == {"Alice": {"stats": "a"}}
+    assert run["math_academy"] == {"Bob": {"weekly_xp": "5"}}
+
+
+@has_proc
+def test_process_tree_rss_includes_children():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    try:
+        own = memory.process_rss(os.getpid())
+        tree = memory.process_tree_rss(os.getpid())
+        assert own > 0
+        assert tree >= own + memory.process_rss(child.pid)
+    finally:
+        child.kill()
+        child.wait()
+
+
+def test_over_ceiling_needs_a_ceiling_and_a_reading():
+    assert not memory.MemoryMonitor().over_ceiling(500, 500)
+    assert not memory.MemoryMonitor(ceiling_mb=100).over_ceiling(None, 500)
+    assert not memory.MemoryMonitor(ceiling_mb=1000).over_ceiling(400, 500)
+    assert memory.MemoryMonitor(ceiling_mb=1000).over_ceiling(600, 500)
+
+
+class _FakeDriver:
+    def __init__(self):
+        self.quit_called = False
+
+    def get(self, url):
+        pass
+
+    def save_screenshot(self, path):
+        pass
+
+    def find_elements(self, by, value):
+        return []
+
+    def quit(self):
+        self.quit_called = True
+
+
+@has_proc
+def test_exceeding_ceiling_spills_and_recycles_driver(monkeypatch):
+    old_driver = _FakeDriver()
+    new_driver = _FakeDriver()
+    monkeypatch.setattr(get_stats, "setup_driver", lambda: new_driver)
+    logins = []
+    monkeypatch.setattr(
+        get_stats.MathAcademyStatsScraper, "login", lambda self, *creds: logins.append(creds)
+    )
+
+    scraper = get_stats.MathAcademyStatsScraper(old_driver)
+    scraper.memory_monitor = memory.MemoryMonitor(ceiling_mb=0)
+    scraper.credentials = ("user", "password")
+    scraper.student_data["Carol"] = {"weekly_xp": "120"}
+
+    scraper.student_done("Carol")
+
+    assert old_driver.quit_called
+    assert scraper.driver is new_driver
+    assert logins == [("user", "password")]
+    assert isinstance(scraper.student_data._items["Carol"], memory._Spilled)
+    assert scraper.student_data["Carol"] == {"weekly_xp": "120"}
+
+
+@has_proc
+def test_recycles_at_most_once_per_min_students(monkeypatch):
+    drivers = []
+
+    def setup_driver():
+        drivers.append(_FakeDriver())
+        return drivers[-1]
+
+    monkeypatch.setattr(get_stats, "setup_driver", setup_driver)
+    monkeypatch.setattr(get_stats.MathAcademyStatsScraper, "login", lambda self, *creds: None)
+
+    scraper = get_stats.MathAcademyStatsScraper(_FakeDriver())
+    # Python alone stays above a ceiling of 0, which recycling the driver cannot fix.
+    scraper.memory_monitor = memory.MemoryMonitor(ceiling_mb=0, recycle_min_students=3)
+    scraper.credentials = ("user", "password")
+
+    for student_name in ["A", "B", "C", "D"]:
+        scraper.student_data[student_name] = {"weekly_xp": "1"}
+        scraper.student_done(student_name)
+
+    assert len(drivers) == 2
+    assert isinstance(scraper.student_data._items["C"], memory._Spilled)
+
+
+class _FakeElement:
+    def __init__(self, attributes):
+        self.attributes = attributes
+
+    def get_attribute(self, name):
+        return self.attributes[name]
+
+    def find_elements(self, by, value):
+        return []
+
+
+@has_proc
+def test_deferred_progress_table_survives_spill(monkeypatch):
+    monkeypatch.setattr(get_stats, "setup_driver", _FakeDriver)
+    scraper_class = get_stats.IXLStatsScraper
+    monkeypatch.setattr(scraper_class, "login", lambda self, *creds: None)
+    monkeypatch.setattr(scraper_class, "select_date_range", lambda self, option="Today": None)
+    monkeypatch.setattr(
+        scraper_class,
+        "get_student_options",
+        lambda self: [_FakeElement({"data-name": "Alice"}), _FakeElement({"data-name": "Idle"})],
+    )
+    monkeypatch.setattr(scraper_class, "select_student", lambda self, name: True)
+
+    def process_student_data(self, name):
+        self.student_data[name] = {"stats": name.lower()}
+        return name == "Alice"
+
+    monkeypatch.setattr(scraper_class, "process_student_data", process_student_data)
+    monkeypatch.setattr(
+        scraper_class,
+        "find_element",
+        lambda self, by, value, timeout=10: _FakeElement({"outerHTML": "<table></table>"}),
+    )
+
+    scraper = scraper_class(_FakeDriver())
+    scraper.settle_delay = 0
+    # With a deadline Alice's details are deferred until after Idle's summary,
+    # whose completion spills everything to disk.
+    scraper.planner = planner.RunPlanner(budget_seconds=3600, reserve_seconds=0)
+    scraper.memory_monitor = memory.MemoryMonitor(ceiling_mb=0)
+
+    scraper.get_stats("user", "password")
+
+    assert isinstance(scraper.student_data._items["Alice"], memory._Spilled)
+    assert scraper.student_data["Alice"] == {"stats": "alice", "progress_table": "<table></table>"}
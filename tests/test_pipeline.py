@@ -0,0 +1,59 @@
+import threading
+
+import pytest
+
+import pipeline
+import report
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_pipeline_renders_same_report_as_serial_rendering(executor, ixl_data, math_academy_data):
+    render_pipeline = pipeline.RenderPipeline(workers=2, max_pending=1, executor=executor)
+    for student_name, data in ixl_data.items():
+        render_pipeline.put("ixl", student_name, data)
+    for student_name, data in math_academy_data.items():
+        render_pipeline.put("math_academy", student_name, data)
+    rendered = render_pipeline.close()
+
+    assert set(rendered) == {("ixl", "Alice"), ("math_academy", "Bob")}
+    assert report.build_report_html(
+        ixl_data, math_academy_data, rendered
+    ) == report.build_report_html(ixl_data, math_academy_data)
+
+
+def test_put_blocks_while_queue_is_full(monkeypatch):
+    release = threading.Event()
+
+    def slow_render(provider, student_name, data):
+        release.wait()
+        return student_name
+
+    monkeypatch.setattr(report, "render_section", slow_render)
+    render_pipeline = pipeline.RenderPipeline(workers=1, max_pending=1)
+    render_pipeline.put("ixl", "first", {})  # taken by the worker, which then blocks
+    render_pipeline.put("ixl", "second", {})  # fills the queue
+
+    third = threading.Thread(target=render_pipeline.put, args=("ixl", "third", {}))
+    third.start()
+    third.join(timeout=0.2)
+    assert third.is_alive()
+
+    release.set()
+    third.join(timeout=5)
+    assert not third.is_alive()
+    assert render_pipeline.close() == {
+        ("ixl", "first"): "first",
+        ("ixl", "second"): "second",
+        ("ixl", "third"): "third",
+    }
+
+
+def test_failed_render_is_left_for_build_report(monkeypatch, ixl_data):
+    def broken_render(provider, student_name, data):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(report, "render_section", broken_render)
+    render_pipeline = pipeline.RenderPipeline(workers=1)
+    render_pipeline.put("ixl", "Alice", ixl_data["Alice"])
+
+    assert render_pipeline.close() == {}
@@ -0,0 +1,146 @@
+import planner
+import report
+
+
+def test_without_budget_everything_is_affordable_in_original_order():
+    run_planner = planner.RunPlanner()
+
+    assert run_planner.plan("ixl", ["Bob", "Alice"]) == ["Bob", "Alice"]
+    assert run_planner.can_afford("ixl", "Bob", planner.DETAIL)
+    assert not run_planner.has_deadline
+
+
+_HISTORY = {
+    "ixl": {
+        "Idle": {"activity": 0.0, "summary": 1.0},
+        "Slow": {"activity": 1.0, "summary": 20.0},
+        "Fast": {"activity": 1.0, "summary": 2.0},
+    }
+}
+
+
+def test_without_budget_history_does_not_reorder_students():
+    run_planner = planner.RunPlanner()
+    run_planner.history = _HISTORY
+
+    assert run_planner.plan("ixl", ["Idle", "New", "Slow", "Fast"]) == [
+        "Idle",
+        "New",
+        "Slow",
+        "Fast",
+    ]
+
+
+def test_with_budget_likely_active_then_cheap_students_come_first():
+    run_planner = planner.RunPlanner(budget_seconds=600)
+    run_planner.history = _HISTORY
+
+    assert run_planner.plan("ixl", ["Idle", "New", "Slow", "Fast"]) == [
+        "Fast",
+        "Slow",
+        "New",
+        "Idle",
+    ]
+
+
+def test_details_wait_until_pending_summaries_fit(clock):
+    run_planner = planner.RunPlanner(budget_seconds=60, reserve_seconds=10, clock=clock)
+    run_planner.plan("math_academy", ["101", "102"])
+    run_planner.plan("ixl", ["Alice"])
+
+    with run_planner.timed("ixl", "Alice", planner.SUMMARY):
+        clock.now += 5
+
+    # 45s left: a 15s detail plus two 5s Math Academy summaries fit.
+    assert run_planner.can_afford("ixl", "Alice", planner.DETAIL)
+
+    clock.now += 25
+    # 20s left: the detail alone would fit, but not with the summaries still to do.
+    assert not run_planner.can_afford("ixl", "Alice", planner.DETAIL)
+    assert run_planner.can_afford("math_academy", "101", planner.SUMMARY)
+
+    clock.now += 17
+    assert not run_planner.can_afford("math_academy", "101", planner.SUMMARY)
+
+
+def test_estimates_are_smoothed_and_persisted(tmp_path, clock):
+    history_path = tmp_path / "planner_history.json"
+    run_planner = planner.RunPlanner(history_path=history_path, clock=clock)
+
+    for seconds in (4.0, 8.0):
+        with run_planner.timed("ixl", "Alice", planner.SUMMARY):
+            clock.now += seconds
+    run_planner.record_activity("ixl", "Alice", True)
+    run_planner.record_activity("ixl", "Alice", False)
+    run_planner.save()
+
+    reloaded = planner.RunPlanner(history_path=history_path)
+    assert reloaded.estimate("ixl", "Alice", planner.SUMMARY) == 6.0
+    assert reloaded.estimate("ixl", "Alice", planner.DETAIL) == planner.DEFAULT_COSTS["detail"]
+    assert reloaded.activity("ixl", "Alice") == 0.5
+
+
+def test_unreadable_history_is_ignored(tmp_path):
+    history_path = tmp_path / "planner_history.json"
+    history_path.write_text("{not json")
+
+    assert planner.RunPlanner(history_path=history_path).history == {}
+
+
+def _run_ixl_steps(run_planner, students, active, clock=None, step_seconds=0):
+    """Drive ixl_steps like a scraper would and return the steps it yielded."""
+    steps = planner.Steps(planner.ixl_steps(run_planner, students))
+    taken = []
+    for step, student, sections in steps:
+        taken.append((step, student, sections) if sections else (step, student))
+        if clock and step in (planner.SUMMARY, planner.DETAIL):
+            clock.now += step_seconds
+        steps.outcome = {planner.SELECT: True, planner.SUMMARY: student in active}.get(step)
+    return taken
+
+
+def test_ixl_steps_collect_details_right_away_without_deadline():
+    assert _run_ixl_steps(planner.RunPlanner(), ["Alice", "Idle"], active={"Alice"}) == [
+        (planner.SELECT, "Alice"),
+        (planner.SUMMARY, "Alice"),
+        (planner.DETAIL, "Alice"),
+        (planner.FINISH, "Alice"),
+        (planner.SELECT, "Idle"),
+        (planner.SUMMARY, "Idle"),
+        (planner.FINISH, "Idle"),
+    ]
+
+
+def test_ixl_steps_defer_details_and_skip_what_does_not_fit(clock):
+    run_planner = planner.RunPlanner(budget_seconds=24, reserve_seconds=0, clock=clock)
+
+    # Each summary takes 10s, so only 4s are left for Carol's summary and Alice's detail.
+    steps = _run_ixl_steps(
+        run_planner, ["Alice", "Bob", "Carol"], active={"Alice"}, clock=clock, step_seconds=10
+    )
+
+    assert steps == [
+        (planner.SELECT, "Alice"),
+        (planner.SUMMARY, "Alice"),
+        (planner.SELECT, "Bob"),
+        (planner.SUMMARY, "Bob"),
+        (planner.FINISH, "Bob"),
+        (planner.SKIP, "Carol", ["stats", "progress_table"]),
+        (planner.FINISH, "Carol"),
+        (planner.SKIP, "Alice", ["progress_table"]),
+        (planner.FINISH, "Alice"),
+    ]
+
+
+def test_report_marks_skipped_sections():
+    html = report.build_report_html(
+        {
+            "Alice": {"stats": "answered 3 questions", "skipped": ["progress_table"]},
+            "Bob": {"stats": "", "skipped": ["stats", "progress_table"]},
+        },
+        {"42": {"student_id": "42", "skipped": ["summary", "activity"]}},
+    )
+
+    assert "<h3>Alice answered 3 questions</h3><p><em>Progress details skipped" in html
+    assert "<h3>Bob</h3><p><em>Stats and progress skipped" in html
+    assert "<h3>Student ID 42</h3><p><em>XP and activity skipped" in html
@@ -0,0 +1,144 @@
+"""Run both scraper backends against the local fixture pages in tests/fixtures."""
+
+import asyncio
+import functools
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import cdp
+import report
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+pytestmark = pytest.mark.skipif(cdp.find_chrome() is None, reason="Chrome is not installed")
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope="module")
+def fixture_server():
+    handler = functools.partial(_QuietHandler, directory=FIXTURES_DIR)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def _configure_ixl(scraper, base_url):
+    scraper.login_url = f"{base_url}/ixl/analytics.html#"
+    scraper.progress_url = f"{base_url}/ixl/progress.html"
+    scraper.settle_delay = 0
+
+
+def _configure_math_academy(scraper, base_url):
+    scraper.login_url = f"{base_url}/mathacademy/login.html"
+    scraper.base_activity_url = f"{base_url}/mathacademy/activity_{{}}.html"
+
+
+def _scrape_with_selenium(base_url):
+    import get_stats
+
+    driver = get_stats.setup_driver()
+    try:
+        ixl_scraper = get_stats.IXLStatsScraper(driver)
+        _configure_ixl(ixl_scraper, base_url)
+        ixl_scraper.get_stats("user", "password")
+
+        math_academy_scraper = get_stats.MathAcademyStatsScraper(driver)
+        _configure_math_academy(math_academy_scraper, base_url)
+        math_academy_scraper.get_stats("user", "password", ["101", "102"])
+    finally:
+        driver.quit()
+    return ixl_scraper.student_data, math_academy_scraper.student_data
+
+
+async def _scrape_with_cdp(base_url):
+    import cdp_scrapers
+
+    browser = await cdp.Browser.launch()
+    try:
+        ixl_scraper = cdp_scrapers.CDPIXLStatsScraper(browser)
+        _configure_ixl(ixl_scraper, base_url)
+        math_academy_scraper = cdp_scrapers.CDPMathAcademyStatsScraper(browser, max_tabs=2)
+        _configure_math_academy(math_academy_scraper, base_url)
+        await asyncio.gather(
+            ixl_scraper.get_stats("user", "password"),
+            math_academy_scraper.get_stats("user", "password", ["101", "102"]),
+        )
+    finally:
+        await browser.close()
+    return ixl_scraper.student_data, math_academy_scraper.student_data
+
+
+@pytest.fixture(scope="module", params=["selenium", "cdp"])
+def scraped(request, fixture_server):
+    if request.param == "cdp":
+        return asyncio.run(_scrape_with_cdp(fixture_server))
+    return _scrape_with_selenium(fixture_server)
+
+
+def test_ixl_stats_for_every_student(scraped):
+    ixl_data, _ = scraped
+
+    assert list(ixl_data) == ["Alice", "Bob"]
+    assert ixl_data["Alice"]["stats"] == (
+        "answered 12 questions spent 10 min practicing made progress in 2 skills"
+    )
+    assert ixl_data["Bob"]["stats"] == (
+        "answered 0 questions spent 0 min practicing made progress in 0 skills"
+    )
+
+
+def test_ixl_progress_table_only_for_active_students(scraped):
+    ixl_data, _ = scraped
+
+    assert "progress_table" not in ixl_data["Bob"]
+    table = report.process_table_html(ixl_data["Alice"]["progress_table"])
+    assert '<td style="border: 1px solid #ddd; padding: 8px;">Unit rates</td>' in table
+    assert "40 to 75" in table
+
+
+def test_math_academy_students_in_configured_order(scraped):
+    _, math_academy_data = scraped
+
+    assert list(math_academy_data) == ["Carol", "Dave"]
+    assert math_academy_data["Carol"] | {"activity_html": None} == {
+        "student_id": "101",
+        "daily_xp_earned": "30",
+        "daily_xp_goal": "40",
+        "weekly_xp": "120",
+        "activity_html": None,
+    }
+    assert math_academy_data["Dave"]["weekly_xp"] == "55"
+
+
+def test_math_academy_activity_parses_two_days(scraped):
+    _, math_academy_data = scraped
+
+    parsed = report.parse_activity_html(math_academy_data["Carol"]["activity_html"])
+    assert parsed == [
+        {"type": "date", "date": "Today", "xp": "30 XP"},
+        {
+            "type": "task",
+            "task_type": "Lesson",
+            "task_name": "Fractions",
+            "completion": "100%",
+            "points": "30",
+        },
+        {"type": "date", "date": "Yesterday", "xp": "20 XP"},
+        {
+            "type": "task",
+            "task_type": "Review",
+            "task_name": "Decimals",
+            "completion": "90%",
+            "points": "20",
+        },
+    ]